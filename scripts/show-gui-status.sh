@@ -4,12 +4,17 @@
 echo "Project Eidolon Graph Visualizer Status"
 echo "======================================="
 
-# Check if the Flask app is running
-if pgrep -f "graph_visualizer.py" > /dev/null; then
-    echo "✅ Graph Visualizer is running"
+# Check if the app is running, either as "python3 graph_visualizer.py" or as "gunicorn ... graph_visualizer:app"
+PIDS=$(pgrep -f "graph_visualizer(\.py|:app)" | paste -sd, -)
+if [ -n "$PIDS" ]; then
+    if pgrep -f "gunicorn.*graph_visualizer:app" > /dev/null; then
+        echo "✅ Graph Visualizer is running (gunicorn)"
+    else
+        echo "✅ Graph Visualizer is running (Flask server)"
+    fi
     
-    # Find the port it's using
-    PORT=$(lsof -i -P | grep Python | grep LISTEN | grep -o ":[0-9]*" | head -1 | cut -d: -f2)
+    # Find the port its processes are listening on
+    PORT=$(lsof -a -p "$PIDS" -iTCP -sTCP:LISTEN -P -n 2>/dev/null | grep -o ":[0-9]* (LISTEN)" | head -1 | grep -o "[0-9]*")
     
     if [ ! -z "$PORT" ]; then
         echo "🌐 URL: http://localhost:$PORT"
@@ -18,13 +18,27 @@ if ! python3 -c "import flask" &> /dev/null; then
     pip3 install flask
 fi
 
+# Check if NumPy is installed (the graph state is kept in NumPy arrays)
+if ! python3 -c "import numpy" &> /dev/null; then
+    echo "Installing NumPy..."
+    pip3 install numpy
+fi
+
 # Change to the tools directory
 cd "$(dirname "$0")/../tools"
 
 echo "Starting web interface..."
-echo "The application will automatically find an available port"
-echo "Press Ctrl+C to stop the server"
-echo ""
 
-# Start the Flask application
-python3 graph_visualizer.py 
\ No newline at end of file
+# Start the application under gunicorn when it is installed, otherwise use the Flask server
+if python3 -c "import gunicorn" &> /dev/null; then
+    # gunicorn.conf.py binds EIDOLON_PORT
+    echo "Serving with gunicorn on http://localhost:${EIDOLON_PORT:-5002}"
+    echo "Press Ctrl+C to stop the server"
+    echo ""
+    gunicorn -c gunicorn.conf.py graph_visualizer:app
+else
+    echo "Serving with the Flask server on http://localhost:5002"
+    echo "Press Ctrl+C to stop the server"
+    echo ""
+    python3 graph_visualizer.py
+fi 
\ No newline at end of file
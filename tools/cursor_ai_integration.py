@@ -4,13 +4,24 @@ Cursor AI Integration for Project Eidolon Agents
 Provides AI capabilities using Cursor's built-in AI with easy transition to external APIs
 """
 
+import hashlib
 import json
+import mmap
 import os
+import re
 import subprocess
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Any
 from abc import ABC, abstractmethod
 
+# Failure strings returned in place of an answer; response caches must not store them
+_ERROR_RESPONSE_RE = re.compile(r"AI response error: |Agent \S+ not found\.$")
+
+def is_error_response(response: str) -> bool:
+    """Whether response is a failure string rather than an answer from the provider"""
+    return _ERROR_RESPONSE_RE.match(response) is not None
+
 class AIProvider(ABC):
     """Abstract base class for AI providers - enables easy swapping"""
     
@@ -23,6 +34,29 @@ class AIProvider(ABC):
     def get_coordinated_response(self, query: str, agents: List[str], context: Dict[str, Any]) -> str:
         """Get coordinated response from multiple agents"""
         pass
+    
+    def get_multi_agent_response(self, agent_ids: List[str], query: str, context: Dict[str, Any]) -> Dict[str, str]:
+        """Get each agent's response to one query; providers that can answer them in one request override this"""
+        # context holds the shared entries once and each agent's own entries under context['agents'][agent_id]
+        shared = {key: value for key, value in context.items() if key != 'agents'}
+        return {agent_id: self.get_response(agent_id, query, {**context['agents'][agent_id], **shared})
+                for agent_id in agent_ids}
+    
+    def get_coordinated_responses_batch(self, queries: List[str], agents: List[List[str]],
+                                        contexts: List[Dict[str, Any]]) -> List[str]:
+        """Get coordinated responses for several queries; providers that take a batch in one request override this"""
+        # Without a batch request, issue the single requests concurrently so callers still wait only once
+        with ThreadPoolExecutor(max_workers=max(1, min(len(queries), 8))) as executor:
+            return list(executor.map(self.get_coordinated_response, queries, agents, contexts))
+    
+    def warm_up(self):
+        """Pay one-off start-up costs (connections, model loading) ahead of the first request"""
+        pass
+
+# Starts each persona's section in a multi-agent prompt, followed by the persona id
+_PERSONA_MARKER = "\n### Persona: "
+# Starts each request's section in a batched coordination prompt, followed by the request index
+_BATCH_MARKER = "\n### Request "
 
 class CursorAIProvider(AIProvider):
     """AI provider using Cursor's built-in AI capabilities"""
@@ -89,7 +123,39 @@ Provide a coordination perspective:"""
     
     def get_coordinated_response(self, query: str, agents: List[str], context: Dict[str, Any]) -> str:
         """Get coordinated response from multiple agents"""
-        coordination_prompt = f"""You are The Stage Manager coordinating responses from multiple agents.
+        return self._call_cursor_ai(self._coordination_prompt(query, agents, context))
+    
+    def get_coordinated_responses_batch(self, queries: List[str], agents: List[List[str]],
+                                        contexts: List[Dict[str, Any]]) -> List[str]:
+        """Get coordinated responses for several queries from one prompt, sending the agent roster only once"""
+        if not queries:
+            return []
+        shared = {'all_agents': contexts[0].get('all_agents', {})}
+        sections = []
+        for index, (query, query_agents, context) in enumerate(zip(queries, agents, contexts)):
+            own_context = {key: value for key, value in context.items() if key != 'all_agents'}
+            sections.append(f"{_BATCH_MARKER}{index}\n" + self._coordination_prompt(query, query_agents, own_context))
+        
+        batch_prompt = f"""Answer each coordination request below independently.
+Reply with a JSON array holding one response per request, in order.
+
+Shared context: {json.dumps(shared, indent=2)}
+""" + "\n".join(sections)
+        
+        reply = self._call_cursor_ai(batch_prompt)
+        try:
+            responses = json.loads(reply)
+        except ValueError:
+            responses = None
+        if isinstance(responses, list) and len(responses) == len(queries) and all(isinstance(r, str) for r in responses):
+            return responses
+        
+        # The reply was not the JSON we asked for; fall back to one request per query
+        return super().get_coordinated_responses_batch(queries, agents, contexts)
+    
+    def _coordination_prompt(self, query: str, agents: List[str], context: Dict[str, Any]) -> str:
+        """Stage Manager prompt asking for a coordinated response to one query"""
+        return f"""You are The Stage Manager coordinating responses from multiple agents.
 
 Query: {query}
 Context: {json.dumps(context, indent=2)}
@@ -104,8 +170,32 @@ Structure your response as:
 4. Synthesis and conclusions
 
 Response:"""
+    
+    def get_multi_agent_response(self, agent_ids: List[str], query: str, context: Dict[str, Any]) -> Dict[str, str]:
+        """Get every agent's response from one prompt, sending the shared context only once"""
+        shared = {key: value for key, value in context.items() if key != 'agents'}
+        sections = []
+        for agent_id in agent_ids:
+            prompt = self.agent_prompts.get(agent_id, f"Agent {agent_id} response to: {query}")
+            sections.append(f"{_PERSONA_MARKER}{agent_id}\n" + prompt.format(
+                query=query, context=json.dumps(context['agents'][agent_id], indent=2)))
+        
+        multi_prompt = f"""Answer the query once for each persona below.
+Reply with a JSON object mapping each persona id to that persona's answer.
+
+Shared context: {json.dumps(shared, indent=2)}
+""" + "\n".join(sections)
+        
+        reply = self._call_cursor_ai(multi_prompt)
+        try:
+            responses = json.loads(reply)
+        except ValueError:
+            responses = None
+        if isinstance(responses, dict) and all(isinstance(responses.get(agent_id), str) for agent_id in agent_ids):
+            return {agent_id: responses[agent_id] for agent_id in agent_ids}
         
-        return self._call_cursor_ai(coordination_prompt)
+        # The reply was not the JSON we asked for; fall back to one request per agent
+        return super().get_multi_agent_response(agent_ids, query, context)
     
     def _call_cursor_ai(self, prompt: str) -> str:
         """Call Cursor's AI using command line interface"""
@@ -136,6 +226,19 @@ Response:"""
         # This simulates what Cursor AI would return
         # In production, replace with actual Cursor AI call
         
+        # A multi-persona prompt gets one simulated answer per persona, as JSON
+        if _PERSONA_MARKER in prompt:
+            sections = prompt.split(_PERSONA_MARKER)[1:]
+            return json.dumps({
+                section.split("\n", 1)[0]: self._simulate_cursor_response(section.split("\n", 1)[1])
+                for section in sections
+            })
+        
+        # A batched coordination prompt gets one simulated answer per request, as a JSON array
+        if _BATCH_MARKER in prompt:
+            sections = prompt.split(_BATCH_MARKER)[1:]
+            return json.dumps([self._simulate_cursor_response(section.split("\n", 1)[1]) for section in sections])
+        
         # Extract the actual query from the coordination prompt
         query_start = prompt.find("Query: ")
         if query_start != -1:
@@ -202,6 +305,23 @@ class CustomAIProvider(AIProvider):
         self.model_path = model_path
         # Custom model integration would go here
     
+    def warm_up(self):
+        """Pull the model files into the page cache so the first request does not wait on disk"""
+        if not os.path.isdir(self.model_path):
+            return
+        for root, _, files in os.walk(self.model_path):
+            for name in files:
+                try:
+                    with open(os.path.join(root, name), 'rb') as f, \
+                            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                        if hasattr(mmap, 'MADV_WILLNEED'):
+                            mapped.madvise(mmap.MADV_WILLNEED)
+                        else:
+                            for offset in range(0, len(mapped), mmap.PAGESIZE):
+                                mapped[offset]
+                except (OSError, ValueError):  # unreadable or empty files cannot be mapped
+                    continue
+    
     def get_response(self, agent_id: str, query: str, context: Dict[str, Any]) -> str:
         """Get AI response using custom model"""
         # Placeholder for custom model integration
@@ -230,34 +350,62 @@ class AIProviderFactory:
 class AgentAISystem:
     """Main AI system for agent coordination"""
     
-    def __init__(self, provider_type: str = "cursor", **provider_kwargs):
+    def __init__(self, provider_type: str = "cursor", session=None, **provider_kwargs):
         self.provider = AIProviderFactory.create_provider(provider_type, **provider_kwargs)
+        self.session = session
         self.agents = {}
         self.entities = {}
         self.relationships = {}
+        self.knowledge_digest = ''
+    
+    def with_provider(self, provider_type: str) -> 'AgentAISystem':
+        """New system on another provider that shares this one's loaded knowledge base"""
+        provider_kwargs = AI_CONFIG['providers'].get(provider_type, {})
+        system = AgentAISystem(provider_type, session=self.session, **provider_kwargs)
+        system.agents, system.entities, system.relationships = self.agents, self.entities, self.relationships
+        system.knowledge_digest = self.knowledge_digest
+        return system
+    
+    def fetch_json(self, url: str) -> Any:
+        """GET a knowledge base endpoint and decode its JSON body"""
+        if self.session is None:
+            from http_pool import SESSION
+            self.session = SESSION
+        
+        return self.session.get(url).json()
     
     def load_knowledge_base(self, base_url: str):
         """Load agents, entities, and relationships from API"""
-        import requests
-        
         try:
             # Load agents
-            response = requests.get(f"{base_url}/api/agents")
-            self.agents = {agent['id']: agent for agent in response.json()}
+            self.agents = {agent['id']: agent for agent in self.fetch_json(f"{base_url}/api/agents")}
             
             # Load entities
-            response = requests.get(f"{base_url}/api/entities")
-            self.entities = {entity['id']: entity for entity in response.json()}
+            self.entities = {entity['id']: entity for entity in self.fetch_json(f"{base_url}/api/entities")}
             
             # Load relationships
-            response = requests.get(f"{base_url}/api/relationships")
-            self.relationships = response.json()
+            self.relationships = self.fetch_json(f"{base_url}/api/relationships")
+            
+            self.knowledge_digest = self._knowledge_digest()
             
             print(f"✅ Loaded {len(self.agents)} agents, {len(self.entities)} entities, {len(self.relationships)} relationships")
             
         except Exception as e:
             print(f"❌ Error loading knowledge base: {e}")
     
+    def _knowledge_digest(self) -> str:
+        """Short digest of the loaded knowledge base's text fields (ids, names, descriptions, types)
+        
+        Numeric fields are left out because the simulation moves them on every tick; new agents, entities
+        or relationships from a prompt or a refresh change the digest.
+        """
+        records = [
+            sorted((key, value) for key, value in item.items() if isinstance(value, str))
+            for item in (*self.agents.values(), *self.entities.values(), *self.relationships)
+        ]
+        payload = json.dumps(sorted(records), separators=(',', ':'))
+        return hashlib.blake2b(payload.encode('utf-8'), digest_size=8).hexdigest()
+    
     def get_agent_response(self, agent_id: str, query: str) -> str:
         """Get AI response from a specific agent"""
         agent = self.agents.get(agent_id)
@@ -272,8 +420,26 @@ class AgentAISystem:
         
         return self.provider.get_response(agent_id, query, context)
     
-    def get_coordinated_response(self, query: str) -> str:
-        """Get coordinated response from multiple agents"""
+    def get_multi_agent_response(self, agent_ids: List[str], query: str) -> Dict[str, str]:
+        """Get responses from several agents to the same query in one provider request"""
+        context = {'related_entities': self._find_related_entities(query), 'agents': {}}
+        responses = {}
+        for agent_id in agent_ids:
+            agent = self.agents.get(agent_id)
+            if not agent:
+                responses[agent_id] = f"Agent {agent_id} not found."
+                continue
+            context['agents'][agent_id] = {
+                'agent': agent,
+                'agent_relationships': self._get_agent_relationships(agent_id)
+            }
+        
+        if context['agents']:
+            responses.update(self.provider.get_multi_agent_response(list(context['agents']), query, context))
+        return {agent_id: responses[agent_id] for agent_id in agent_ids}
+    
+    def _coordination_context(self, query: str):
+        """Relevant agents and the provider context for a coordinated response"""
         # Determine relevant agents
         relevant_agents = self._determine_relevant_agents(query)
         
@@ -283,9 +449,22 @@ class AgentAISystem:
             'related_entities': self._find_related_entities(query),
             'all_agents': self.agents
         }
-        
+        return relevant_agents, context
+    
+    def get_coordinated_response(self, query: str) -> str:
+        """Get coordinated response from multiple agents"""
+        relevant_agents, context = self._coordination_context(query)
         return self.provider.get_coordinated_response(query, relevant_agents, context)
     
+    def get_coordinated_responses_batch(self, queries: List[str]) -> List[str]:
+        """Get coordinated responses for several queries in one provider request"""
+        agents, contexts = [], []
+        for query in queries:
+            relevant_agents, context = self._coordination_context(query)
+            agents.append(relevant_agents)
+            contexts.append(context)
+        return self.provider.get_coordinated_responses_batch(list(queries), agents, contexts)
+    
     def _find_related_entities(self, query: str) -> List[Dict]:
         """Find entities related to the query"""
         query_lower = query.lower()
@@ -338,13 +517,13 @@ AI_CONFIG = {
     }
 }
 
-def create_ai_system() -> AgentAISystem:
-    """Create AI system with current configuration"""
+def create_ai_system(session=None) -> AgentAISystem:
+    """Create AI system with current configuration; HTTP goes through the shared pool unless a session is given"""
     config = AI_CONFIG
     provider_type = config['current_provider']
     provider_kwargs = config['providers'].get(provider_type, {})
     
-    return AgentAISystem(provider_type, **provider_kwargs)
+    return AgentAISystem(provider_type, session=session, **provider_kwargs)
 
 if __name__ == '__main__':
     # Example usage
@@ -4,13 +4,87 @@ Generate word nodes and verified thoughts for the knowledge graph.
 This script creates entities for common words and their definitions as verified thoughts.
 """
 
+import asyncio
 import json
+import logging
 import os
 import re
 from typing import List, Dict, Any
 import urllib.request
 import urllib.parse
 
+try:
+    import httpx
+except ImportError:  # Optional: without httpx, definitions are fetched one at a time
+    httpx = None
+
+try:
+    import simdjson
+    # One parser reused for every response; documents are read before the next parse
+    _SIMDJSON_PARSER = simdjson.Parser()
+except ImportError:  # Optional: fall back to orjson, then the stdlib json module
+    simdjson = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import h2  # noqa: F401 - enables HTTP/2 support in httpx
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+DICTIONARY_API_URL = "https://api.dictionaryapi.dev/api/v2/entries/en/{}"
+DEFINITION_POINTER = "/0/meanings/0/definitions/0/definition"
+
+# A handful of HTTP/2 connections carry all in-flight requests as multiplexed streams;
+# over HTTP/1.1 each connection carries one request at a time, so in-flight is capped to match
+MAX_CONNECTIONS = 4
+MAX_IN_FLIGHT = 100 if HTTP2_AVAILABLE else MAX_CONNECTIONS
+PROGRESS_EVERY = 100
+
+def _log_progress(done: int, total: int):
+    """Log fetch progress every PROGRESS_EVERY words and at the end"""
+    if done % PROGRESS_EVERY == 0 or done == total:
+        logger.info("Fetched definitions for %d/%d words", done, total)
+
+def _fallback_definition(word: str) -> str:
+    """Placeholder used when no definition could be fetched for a word"""
+    return f"A common English word: {word}"
+
+def _extract_definition(data: Any, word: str) -> str:
+    """Pull the first definition out of a dictionary API response"""
+    if data and isinstance(data, list) and len(data) > 0:
+        meanings = data[0].get('meanings', [])
+        if meanings and len(meanings) > 0:
+            definitions = meanings[0].get('definitions', [])
+            if definitions and len(definitions) > 0:
+                return definitions[0].get('definition', f"A word meaning {word}")
+    
+    # Fallback for words not found in API
+    return _fallback_definition(word)
+
+def _parse_definition(raw: bytes, word: str) -> str:
+    """
+    Parse a dictionary API response body and return the first definition.
+    simdjson walks straight to the single leaf we need without building the full object tree.
+    """
+    if simdjson is not None:
+        try:
+            definition = _SIMDJSON_PARSER.parse(raw).at_pointer(DEFINITION_POINTER)
+            if isinstance(definition, str):
+                return definition
+        except Exception:
+            pass
+        return _fallback_definition(word)
+    
+    data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+    return _extract_definition(data, word)
+
 def fetch_word_definition(word: str) -> str:
     """
     Fetch a simple definition for a word using a free dictionary API.
@@ -18,21 +92,65 @@ def fetch_word_definition(word: str) -> str:
     """
     try:
         # Use Free Dictionary API
-        url = f"https://api.dictionaryapi.dev/api/v2/entries/en/{urllib.parse.quote(word)}"
+        url = DICTIONARY_API_URL.format(urllib.parse.quote(word))
         with urllib.request.urlopen(url) as response:
-            data = json.loads(response.read())
-            if data and isinstance(data, list) and len(data) > 0:
-                meanings = data[0].get('meanings', [])
-                if meanings and len(meanings) > 0:
-                    definitions = meanings[0].get('definitions', [])
-                    if definitions and len(definitions) > 0:
-                        return definitions[0].get('definition', f"A word meaning {word}")
-        
-        # Fallback for words not found in API
-        return f"A common English word: {word}"
+            return _parse_definition(response.read(), word)
     except Exception as e:
         # Fallback for any API errors
-        return f"A common English word: {word}"
+        logger.debug("Definition request for %r failed: %r", word, e)
+        return _fallback_definition(word)
+
+async def _fetch_word_definition_async(client, semaphore: asyncio.Semaphore, word: str) -> str:
+    """Fetch a single definition over the shared async client"""
+    try:
+        async with semaphore:
+            response = await client.get(DICTIONARY_API_URL.format(urllib.parse.quote(word)))
+        if response.status_code != 200:
+            logger.debug("Definition request for %r returned HTTP %d", word, response.status_code)
+            return _fallback_definition(word)
+        return _parse_definition(response.content, word)
+    except Exception as e:
+        # Fallback for any API errors
+        logger.debug("Definition request for %r failed: %r", word, e)
+        return _fallback_definition(word)
+
+async def _fetch_word_definitions_async(words: List[str]) -> List[str]:
+    """Fetch all definitions concurrently over one pooled (HTTP/2 when available) client"""
+    limits = httpx.Limits(max_connections=MAX_CONNECTIONS, max_keepalive_connections=MAX_CONNECTIONS)
+    semaphore = asyncio.Semaphore(MAX_IN_FLIGHT)
+    done = 0
+    
+    async def fetch(client, word: str) -> str:
+        nonlocal done
+        definition = await _fetch_word_definition_async(client, semaphore, word)
+        # Completions are counted as they happen; gather still returns results in input order
+        done += 1
+        _log_progress(done, len(words))
+        return definition
+    
+    # Requests queue on the semaphore, not the pool, so only connect/read/write are time-limited
+    timeout = httpx.Timeout(10.0, pool=None)
+    async with httpx.AsyncClient(http2=HTTP2_AVAILABLE, limits=limits, timeout=timeout) as client:
+        return await asyncio.gather(*(fetch(client, word) for word in words))
+
+def fetch_word_definitions(words: List[str]) -> List[str]:
+    """
+    Fetch definitions for many words, in the same order as the input.
+    Uses a shared httpx.AsyncClient when httpx is installed, otherwise urllib.
+    """
+    if httpx is None:
+        definitions = []
+        for word in words:
+            definitions.append(fetch_word_definition(word))
+            _log_progress(len(definitions), len(words))
+    else:
+        definitions = asyncio.run(_fetch_word_definitions_async(words))
+    
+    fallbacks = sum(1 for word, definition in zip(words, definitions) if definition == _fallback_definition(word))
+    if fallbacks:
+        logger.warning("No definition fetched for %d of %d words; used the placeholder definition instead",
+                       fallbacks, len(words))
+    return definitions
 
 def generate_word_nodes_with_thoughts():
     """
@@ -49,14 +167,14 @@ def generate_word_nodes_with_thoughts():
     
     print(f"Processing {len(words)} words...")
     
+    # Fetch every definition up front so the requests run concurrently
+    definitions = fetch_word_definitions(words)
+    
     # Generate entities
     entities = []
     thoughts = []
     
-    for i, word in enumerate(words):
-        if i % 100 == 0:
-            print(f"Processing word {i+1}/{len(words)}: {word}")
-        
+    for word, definition in zip(words, definitions):
         # Create entity for the word
         word_id = word.lower()
         entity = {
@@ -72,7 +190,6 @@ def generate_word_nodes_with_thoughts():
         entities.append(entity)
         
         # Create verified thought for the word's definition
-        definition = fetch_word_definition(word)
         thought_id = f"thought_{word_id}_definition"
         thought = {
             "id": thought_id,
@@ -179,6 +296,8 @@ def generate_simple_word_nodes():
 if __name__ == "__main__":
     import sys
     
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    
     if len(sys.argv) > 1 and sys.argv[1] == "--simple":
         print("Generating simple word nodes without API calls...")
         generate_simple_word_nodes()
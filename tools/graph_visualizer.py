@@ -4,25 +4,454 @@ Project Eidolon Graph Visualizer
 A web-based GUI for exploring the strain-based knowledge graph
 """
 
-from flask import Flask, render_template, jsonify, request, Response
+from flask import Flask, render_template, request, Response
 import json
+import gzip
+import hashlib
+import mmap
 import os
 import sys
 from datetime import datetime
+from collections import defaultdict, deque
+from functools import lru_cache
 import threading
 import time
 import queue
-import random
+import uuid
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib json module
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:  # zstandard is optional; .json.zst data files are ignored without it
+    zstandard = None
+
+try:
+    from numba import float64, njit, prange, vectorize
+except ImportError:  # numba is optional; fall back to the NumPy gravity update
+    njit = None
 
 app = Flask(__name__)
 
+# Shared generator for the per-tick and per-prompt random draws
+rng = np.random.default_rng()
+
+# Hot numeric entity fields, stored one record per entity (row i <-> GraphVisualizer.entities[i])
+# Strain and resistance are small bounded values, so half precision is enough to store them
+ENTITY_DTYPE = np.dtype([
+    ('access', 'f4'),   # access_count
+    ('last', 'f8'),     # last_accessed (timestamps need double precision)
+    ('strain', 'f2'),   # strain_amplitude
+    ('mass', 'f4'),     # gravitational_mass
+    ('resist', 'f2'),   # node_resistance
+    ('freq', 'i2'),     # musical_frequency
+])
+
+def json_loads(raw):
+    """Decode JSON bytes, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+def _json_default(obj):
+    """Convert NumPy arrays and scalars for the stdlib json encoder"""
+    if isinstance(obj, (np.ndarray, np.generic)):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def json_dumps(obj):
+    """Encode an object to JSON bytes, using orjson when it is installed; NumPy values are supported"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_json_default, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj, default=_json_default).encode('utf-8')
+
+def find_data_file(path):
+    """Return the newest existing variant of a JSON data file (.json.zst, .json.gz or .json), or None"""
+    candidates = [path + '.gz', path]
+    if zstandard is not None:
+        candidates.insert(0, path + '.zst')
+    existing = [c for c in candidates if os.path.exists(c)]
+    if not existing:
+        return None
+    return max(existing, key=os.path.getmtime)
+
+def read_json_file(path):
+    """Decode a plain, gzip or zstd compressed JSON file through a read-only memory map"""
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if path.endswith('.zst'):
+            raw = zstandard.ZstdDecompressor().decompress(mm)
+        elif path.endswith('.gz'):
+            raw = gzip.decompress(mm)
+        else:
+            raw = mm[:]
+    return json_loads(raw)
+
+def compress_data_file(path):
+    """Write a compressed copy of a JSON data file next to it (zstd when available, otherwise gzip)"""
+    payload = json_dumps(read_json_file(path))
+    if zstandard is not None:
+        out_path = path + '.zst'
+        payload = zstandard.ZstdCompressor(level=3).compress(payload)
+    else:
+        out_path = path + '.gz'
+        payload = gzip.compress(payload)
+    with open(out_path, 'wb') as f:
+        f.write(payload)
+    return out_path
+
+def json_response(obj, status=200):
+    """Build a JSON response without going through Flask's jsonify"""
+    return Response(json_dumps(obj), status=status, mimetype='application/json')
+
+def _gravitational_mass_numpy(access, last, now):
+    """Gravity formula: mass scales with access count and is boosted by recent access"""
+    return access * (1.0 + 1.0 / np.maximum(now - last, 1.0))
+
+def _update_strain_numpy(last, strain, resistance, now, rand01, dissonance):
+    """Update the entity strain arrays in place for one tick using whole-array NumPy operations"""
+    last.fill(now)
+    
+    # Update node resistance as summed strain amplitudes
+    # Simulate incoming strain from connections (self-strain only for now)
+    resistance[:] = strain
+    
+    # Decay cognitive dissonance over time (strain only exists when there's contradiction)
+    # Strained entities have a 5% chance of new contradiction detection, otherwise decay
+    strain[:] = np.where(strain > 0.0, np.where(rand01 < 0.05, strain + dissonance, strain * 0.98), strain)
+
+def _decay_and_dissonate_numpy(strain, rand01, dissonance, threshold=0.05, decay=0.98):
+    """Add dissonance where a contradiction is detected (rand01 < threshold) and decay the other strains, in place"""
+    strain[:] = np.where(rand01 < threshold, strain + dissonance, np.maximum(strain * decay, 0.0))
+
+if njit is not None:
+    @vectorize([float64(float64, float64, float64)], target='parallel')
+    def _gravitational_mass_numba(access, last, now):
+        """Numba ufunc equivalent of _gravitational_mass_numpy"""
+        time_since_access = now - last
+        if time_since_access < 1.0:
+            time_since_access = 1.0
+        return access * (1.0 + 1.0 / time_since_access)
+    
+    @njit(cache=True, parallel=True)
+    def _update_strain_numba(last, strain, resistance, now, rand01, dissonance):
+        """Numba-compiled equivalent of _update_strain_numpy"""
+        for i in prange(last.size):
+            last[i] = now
+            resistance[i] = strain[i]
+            if strain[i] > 0.0:
+                if rand01[i] < 0.05:
+                    strain[i] += dissonance[i]
+                else:
+                    strain[i] *= 0.98
+    
+    @njit(cache=True)
+    def _decay_and_dissonate_numba(strain, rand01, dissonance, threshold=0.05, decay=0.98):
+        """Numba-compiled equivalent of _decay_and_dissonate_numpy"""
+        for i in range(strain.shape[0]):
+            if rand01[i] < threshold:
+                strain[i] += dissonance[i]
+            else:
+                strain[i] = max(0.0, strain[i] * decay)
+    
+    gravitational_mass = _gravitational_mass_numba
+    update_strain = _update_strain_numba
+    decay_and_dissonate = _decay_and_dissonate_numba
+    # Compile once at startup, for the entity record field types, so the first tick does not pay the JIT cost
+    _warmup = np.zeros(1, dtype=ENTITY_DTYPE)
+    _warmup_rand = np.zeros(1, dtype=np.float64)
+    _warmup_work = np.zeros(1, dtype=np.float32)
+    gravitational_mass(_warmup['access'], _warmup['last'], 0.0)
+    update_strain(_warmup['last'], _warmup_work, _warmup_work.copy(), 0.0, _warmup_rand, _warmup_rand)
+    decay_and_dissonate(_warmup_rand.copy(), _warmup_rand, _warmup_rand)
+else:
+    gravitational_mass = _gravitational_mass_numpy
+    update_strain = _update_strain_numpy
+    decay_and_dissonate = _decay_and_dissonate_numpy
+
+# Sample data, built once at import and copied by GraphVisualizer.load_sample_data
+# Agents (Thrones)
+_SAMPLE_AGENTS = (
+    {
+        "id": "skeptic",
+        "name": "ThroneOfTheSkeptic",
+        "agent": "The Skeptic",
+        "domain": "skeptic",
+        "authority_level": "triggered",
+        "current_strain": 0.0,
+        "max_strain": 1.0,
+        "is_active": True,
+        "keywords": ["logic", "validation", "skepticism"]
+    },
+    {
+        "id": "engineer",
+        "name": "ThroneOfTheEngineer", 
+        "agent": "The Engineer",
+        "domain": "engineer",
+        "authority_level": "triggered",
+        "current_strain": 0.0,
+        "max_strain": 1.0,
+        "is_active": True,
+        "keywords": ["mathematics", "proofs", "calculations", "how do i", "process", "method", "procedure"]
+    },
+    {
+        "id": "dreamer",
+        "name": "ThroneOfTheDreamer",
+        "agent": "The Dreamer", 
+        "domain": "dreamer",
+        "authority_level": "triggered",
+        "current_strain": 0.0,
+        "max_strain": 1.0,
+        "is_active": True,
+        "keywords": ["creativity", "imagination", "innovation"]
+    },
+    {
+        "id": "philosopher",
+        "name": "ThroneOfThePhilosopher",
+        "agent": "The Philosopher",
+        "domain": "philosopher", 
+        "authority_level": "triggered",
+        "current_strain": 0.0,
+        "max_strain": 1.0,
+        "is_active": True,
+        "keywords": ["wisdom", "ethics", "metaphysics"]
+    },
+    {
+        "id": "stage_manager",
+        "name": "ThroneOfTheStage_manager",
+        "agent": "The Stage Manager",
+        "domain": "stage_manager",
+        "authority_level": "triggered", 
+        "current_strain": 0.0,
+        "max_strain": 1.0,
+        "is_active": True,
+        "keywords": ["context", "coordination", "management"]
+    },
+    {
+        "id": "investigator",
+        "name": "ThroneOfTheInvestigator",
+        "agent": "The Investigator",
+        "domain": "investigator",
+        "authority_level": "triggered",
+        "current_strain": 0.0,
+        "max_strain": 1.0,
+        "is_active": True,
+        "keywords": ["research", "analysis", "discovery"]
+    },
+    {
+        "id": "archivist",
+        "name": "ThroneOfTheArchivist",
+        "agent": "The Archivist",
+        "domain": "archivist",
+        "authority_level": "triggered",
+        "current_strain": 0.0,
+        "max_strain": 1.0,
+        "is_active": True,
+        "keywords": ["memory", "storage", "retrieval"]
+    }
+)
+
+# Entities - Smallest units of knowledge for maximum connections
+_SAMPLE_ENTITIES = (
+    {
+        "id": "pythagorean",
+        "name": "Pythagorean",
+        "entity_type": "concept_type",
+        "description": "Related to Pythagoras",
+        "strain_amplitude": 0.0,  # No cognitive dissonance initially
+        "node_resistance": 0.0,   # No incoming strain initially
+        "musical_frequency": 440,  # A4
+        "gravitational_mass": 1.0,
+        "access_count": 5,
+        "last_accessed": None  # Stamped with the load time by load_sample_data
+    },
+    {
+        "id": "theorem",
+        "name": "Theorem",
+        "entity_type": "concept_type", 
+        "description": "Mathematical statement proven true",
+        "strain_amplitude": 0.0,
+        "node_resistance": 0.0,
+        "musical_frequency": 493,  # B4
+        "gravitational_mass": 1.0,
+        "access_count": 3,
+        "last_accessed": None  # Stamped with the load time by load_sample_data
+    },
+    {
+        "id": "logical_rule", 
+        "name": "Modus Ponens",
+        "entity_type": "concept_type",
+        "description": "If P then Q, P, therefore Q",
+        "strain_amplitude": 0.92,
+        "strain_resistance": 0.1,
+        "strain_frequency": 8,
+        "access_count": 8
+    },
+    {
+        "id": "context_info",
+        "name": "Quantum Mechanics Context", 
+        "entity_type": "concept_type",
+        "description": "Physics domain context",
+        "strain_amplitude": 0.45,
+        "strain_resistance": 0.7,
+        "strain_frequency": 3,
+        "access_count": 3
+    },
+    {
+        "id": "creative_concept",
+        "name": "Neural Network Architecture",
+        "entity_type": "concept_type", 
+        "description": "AI system design",
+        "strain_amplitude": 0.23,
+        "strain_resistance": 0.9,
+        "strain_frequency": 1,
+        "access_count": 1
+    },
+    {
+        "id": "person",
+        "name": "Albert Einstein",
+        "entity_type": "person",
+        "description": "Theoretical physicist",
+        "strain_amplitude": 0.78,
+        "strain_resistance": 0.4,
+        "strain_frequency": 6,
+        "access_count": 6
+    },
+    {
+        "id": "place",
+        "name": "MIT",
+        "entity_type": "place",
+        "description": "Massachusetts Institute of Technology",
+        "strain_amplitude": 0.65,
+        "strain_resistance": 0.6,
+        "strain_frequency": 4,
+        "access_count": 4
+    },
+    {
+        "id": "event",
+        "name": "Quantum Revolution",
+        "entity_type": "event",
+        "description": "Early 20th century physics",
+        "strain_amplitude": 0.89,
+        "strain_resistance": 0.2,
+        "strain_frequency": 7,
+        "access_count": 7
+    }
+)
+
+# Authority Relationships
+_SAMPLE_RELATIONSHIPS = (
+    {
+        "id": "auth_engineer_mathematical_theorem",
+"from": "engineer",
+        "to": "mathematical_theorem",
+        "type": "has_authority",
+        "authority_strength": 0.9,
+        "strain_amplitude": 0.72
+    },
+    {
+        "id": "auth_skeptic_logical_rule",
+        "from": "skeptic", 
+        "to": "logical_rule",
+        "type": "has_authority",
+        "authority_strength": 0.95,
+        "strain_amplitude": 0.76
+    },
+    {
+        "id": "auth_stage_manager_context_info",
+        "from": "stage_manager",
+        "to": "context_info", 
+        "type": "has_authority",
+        "authority_strength": 0.7,
+        "strain_amplitude": 0.56
+    },
+    {
+        "id": "auth_dreamer_creative_concept",
+        "from": "dreamer",
+        "to": "creative_concept",
+        "type": "has_authority",
+        "authority_strength": 0.6,
+        "strain_amplitude": 0.48
+    },
+    {
+        "id": "auth_philosopher_person",
+        "from": "philosopher",
+        "to": "person",
+        "type": "has_authority", 
+        "authority_strength": 0.8,
+        "strain_amplitude": 0.64
+    },
+    {
+        "id": "auth_investigator_event",
+        "from": "investigator",
+        "to": "event",
+        "type": "has_authority",
+        "authority_strength": 0.85,
+        "strain_amplitude": 0.68
+    },
+    {
+        "id": "auth_archivist_place",
+        "from": "archivist",
+        "to": "place",
+        "type": "has_authority",
+        "authority_strength": 0.75,
+        "strain_amplitude": 0.60
+    }
+)
+
 # Sample data structure (in production, this would connect to TinkerPop)
 class GraphVisualizer:
-    def __init__(self):
+    def __init__(self, load=True):
         self.agents = []
+        # Only the prompt worker appends to self.entities and reloads replace it wholesale;
+        # readers use entities_view, an immutable snapshot published with each graph snapshot
         self.entities = []
+        self.entities_view = ()
         self.relationships = []
-        self.load_real_data()
+        # Hot numeric entity fields; self.entities keeps the string/meta fields
+        self.e_num = np.zeros(0, dtype=ENTITY_DTYPE)
+        # Lookup indices for get_entities: entity_type -> rows, and rows ordered by strain
+        self._by_type = defaultdict(list)
+        self._strain_order = np.zeros(0, dtype=np.intp)
+        self._strain_sorted = np.zeros(0, dtype=np.float64)
+        self._strain_index_dirty = True
+        # Lowercased entity name -> row, for prompt word lookups
+        self._row_by_name = {}
+        # Guards the entity arrays against concurrent ticks and prompt updates
+        self.lock = threading.RLock()
+        self._nodes_cache = []
+        self._graph_json_cache = b''
+        # Bumped on every snapshot rebuild; served as the ETag of /api/graph-data
+        self._version = 0
+        self._stats = self.compute_graph_stats()
+        if load:
+            self.load_real_data()
+        # Always publish a snapshot, so an empty graph is still served as valid JSON before data arrives
+        self.refresh_graph_cache()
+    
+    def load_in_background(self, on_loaded=None):
+        """Load data on a worker thread and swap it in atomically when it is ready; on_loaded runs after the swap"""
+        def worker():
+            staged = GraphVisualizer(load=False)
+            staged.load_real_data()
+            with self.lock:
+                self.agents = staged.agents
+                self.entities = staged.entities
+                self.relationships = staged.relationships
+                self.e_num = staged.e_num
+                self._by_type = staged._by_type
+                self._row_by_name = staged._row_by_name
+                self._strain_index_dirty = True
+                self.refresh_graph_cache()
+            if on_loaded is not None:
+                on_loaded()
+        
+        loader = threading.Thread(target=worker, daemon=True)
+        loader.start()
+        return loader
     
     def load_real_data(self):
         """Load real Project Eidolon data from the system"""
@@ -37,21 +466,23 @@ class GraphVisualizer:
             print(f"Error loading real data: {e}")
             print("Falling back to sample data...")
             self.load_sample_data()
+            self.migrate_entities_to_new_structure()
+            self.build_entity_arrays()
     
     def load_from_json(self):
         """Load entities and relationships from JSON file"""
         try:
-            import json
-            import os
-            
             # Try AI-enhanced knowledge first, then comprehensive, then sample data
             ai_enhanced_file = os.path.join(os.path.dirname(__file__), 'comprehensive_knowledge_ai_enhanced.json')
             comprehensive_file = os.path.join(os.path.dirname(__file__), 'comprehensive_knowledge.json')
             sample_file = os.path.join(os.path.dirname(__file__), 'sample_data.json')
             
-            if os.path.exists(ai_enhanced_file):
-                with open(ai_enhanced_file, 'r') as f:
-                    data = json.load(f)
+            ai_enhanced_file = find_data_file(ai_enhanced_file)
+            comprehensive_file = find_data_file(comprehensive_file)
+            sample_file = find_data_file(sample_file)
+            
+            if ai_enhanced_file:
+                data = read_json_file(ai_enhanced_file)
                 
                 self.entities = data.get('entities', [])
                 self.relationships = data.get('relationships', [])
@@ -65,9 +496,8 @@ class GraphVisualizer:
                 print(f"   • AI-created entities: {len(ai_entities)}")
                 print(f"   • AI-created relationships: {len(ai_relationships)}")
                 
-            elif os.path.exists(comprehensive_file):
-                with open(comprehensive_file, 'r') as f:
-                    data = json.load(f)
+            elif comprehensive_file:
+                data = read_json_file(comprehensive_file)
                 
                 self.entities = data.get('entities', [])
                 self.relationships = data.get('relationships', [])
@@ -82,9 +512,8 @@ class GraphVisualizer:
                             formatted_key = k.replace('_', ' ').title()
                             domain_stats.append(f"{formatted_key}: {v}")
                     print(f"   • Domains: {', '.join(domain_stats)}")
-            elif os.path.exists(sample_file):
-                with open(sample_file, 'r') as f:
-                    data = json.load(f)
+            elif sample_file:
+                data = read_json_file(sample_file)
                 
                 self.entities = data.get('entities', [])
                 self.relationships = data.get('relationships', [])
@@ -99,12 +528,19 @@ class GraphVisualizer:
         
         # Migrate entities to new field structure
         self.migrate_entities_to_new_structure()
+        self.build_entity_arrays()
     
     def migrate_entities_to_new_structure(self):
-        """Migrate entities from old field names to new gravity-based structure"""
+        """Migrate entities from old field names to new gravity-based structure and share repeated type strings"""
         current_time = time.time()
+        intern = sys.intern
         
         for entity in self.entities:
+            # A handful of type names repeat across every record; keep one string object per name
+            entity_type = entity.get('entity_type')
+            if isinstance(entity_type, str):
+                entity['entity_type'] = intern(entity_type)
+            
             # Convert old strain_resistance to node_resistance
             if 'strain_resistance' in entity and 'node_resistance' not in entity:
                 entity['node_resistance'] = entity['strain_resistance']
@@ -130,17 +566,18 @@ class GraphVisualizer:
             if 'gravitational_mass' not in entity:
                 entity['gravitational_mass'] = 1.0
             
+            # last_accessed is always stored as a float timestamp so the updater never parses dates
             if 'last_accessed' not in entity:
                 # Use modified date if available, otherwise current time
                 if 'modified' in entity:
                     try:
-                        import datetime
-                        parsed_date = datetime.datetime.fromisoformat(entity['modified'].replace('Z', '+00:00'))
-                        entity['last_accessed'] = parsed_date.timestamp()
-                    except:
+                        entity['last_accessed'] = _iso_to_ts(entity['modified'])
+                    except (AttributeError, TypeError, ValueError):
                         entity['last_accessed'] = current_time
                 else:
                     entity['last_accessed'] = current_time
+            else:
+                entity['last_accessed'] = _to_timestamp(entity['last_accessed'], current_time)
             
             # Ensure strain_amplitude exists
             if 'strain_amplitude' not in entity:
@@ -149,12 +586,123 @@ class GraphVisualizer:
             # Ensure access_count exists
             if 'access_count' not in entity:
                 entity['access_count'] = 1
+            
+            # Ensure the remaining gravity-based fields exist
+            if 'node_resistance' not in entity:
+                entity['node_resistance'] = 0.0
+            if 'musical_frequency' not in entity:
+                entity['musical_frequency'] = 440  # Default to A4
+        
+        for relationship in self.relationships:
+            for field in ('type', 'relationship_type'):
+                value = relationship.get(field)
+                if isinstance(value, str):
+                    relationship[field] = intern(value)
+    
+    def migrate_agents_to_new_structure(self, agents):
+        """Add gravity-based fields to agents and store last_accessed as a float timestamp"""
+        current_time = time.time()
+        
+        for agent in agents:
+            if 'gravitational_mass' not in agent:
+                agent['gravitational_mass'] = 1.0
+            if 'access_count' not in agent:
+                agent['access_count'] = 1
+            agent['last_accessed'] = _to_timestamp(agent.get('last_accessed', current_time), current_time)
+        
+        return agents
+    
+    def build_entity_arrays(self):
+        """Build the numeric entity records used by the background updater"""
+        with self.lock:
+            self.e_num = np.array([_entity_record(e) for e in self.entities], dtype=ENTITY_DTYPE)
+            
+            self._by_type = defaultdict(list)
+            self._row_by_name = {}
+            for i, entity in enumerate(self.entities):
+                self._by_type[entity.get('entity_type')].append(i)
+                # First entity with a name wins, as with a front-to-back scan
+                self._row_by_name.setdefault(entity.get('name', '').lower(), i)
+            self._strain_index_dirty = True
+    
+    def add_entities(self, entities, names_lc=None):
+        """Append entities and their numeric records with a single array copy; names_lc are their lowercased names"""
+        if not entities:
+            return
+        if names_lc is None:
+            names_lc = [entity.get('name', '').lower() for entity in entities]
+        with self.lock:
+            start = len(self.entities)
+            self.entities.extend(entities)
+            records = np.array([_entity_record(entity) for entity in entities], dtype=ENTITY_DTYPE)
+            self.e_num = np.concatenate((self.e_num, records))
+            for i, (entity, name_lc) in enumerate(zip(entities, names_lc), start):
+                self._by_type[entity.get('entity_type')].append(i)
+                self._row_by_name.setdefault(name_lc, i)
+            self._strain_index_dirty = True
+    
+    def find_entity(self, name):
+        """Return the row of the entity with the given lowercased name, or None"""
+        return self._row_by_name.get(name)
+    
+    def record_access(self, index, current_time):
+        """Count an access to the entity at the given row"""
+        with self.lock:
+            self.e_num['access'][index] += 1
+            self.e_num['last'][index] = current_time
+            entity = self.entities[index]
+            entity['access_count'] += 1
+            entity['last_accessed'] = current_time
+    
+    def apply_dissonance(self, count, rand01, dissonances):
+        """Add dissonance to the first count rows where a contradiction was detected (rand01 < 0.05) and decay the rest
+        
+        Returns the old and new strain arrays; the entity dicts pick the values up on the next snapshot.
+        """
+        with self.lock:
+            strain = self.e_num['strain'][:count]
+            old_strain = strain.astype(np.float64)
+            new_strain = old_strain.copy()
+            decay_and_dissonate(new_strain, rand01, dissonances)
+            strain[:] = new_strain
+            self._strain_index_dirty = True
+            return old_strain, new_strain
+    
+    def update_entity_gravity(self, current_time):
+        """Vectorized gravitational mass and strain update over all entities"""
+        with self.lock:
+            e_num = self.e_num
+            n = e_num.size
+            # Random draws happen outside the kernel; numba's RNG is not safe across prange threads
+            rand01 = rng.random(n)
+            dissonance = rng.uniform(0.1, 0.2, n)
+            # Calculate new gravitational mass using gravity formula, then update strain
+            e_num['mass'] = gravitational_mass(e_num['access'], e_num['last'], current_time)
+            # Strain math runs in float32 and is stored back at half precision
+            strain = e_num['strain'].astype(np.float32)
+            resistance = np.empty_like(strain)
+            update_strain(e_num['last'], strain, resistance, current_time, rand01, dissonance)
+            e_num['strain'] = strain
+            e_num['resist'] = resistance
+            self._strain_index_dirty = True
+    
+    def sync_entity_dicts(self):
+        """Write the numeric entity records back into the entity dicts"""
+        with self.lock:
+            e_num = self.e_num
+            for entity, mass, last, strain, resistance in zip(
+                    self.entities, e_num['mass'].tolist(), e_num['last'].tolist(),
+                    e_num['strain'].tolist(), e_num['resist'].tolist()):
+                entity['gravitational_mass'] = mass
+                entity['last_accessed'] = last
+                entity['strain_amplitude'] = strain
+                entity['node_resistance'] = resistance
     
     def load_real_agents(self):
         """Load real agent data from the system"""
         try:
             # Define the real agents based on the Project Eidolon architecture
-            self.agents = [
+            agents = [
                 {
                     "id": "engineer",
                     "name": "ThroneOfTheEngineer",
@@ -247,6 +795,7 @@ class GraphVisualizer:
                     "last_accessed": "2024-12-21T00:00:00"
                 }
             ]
+            self.agents = self.migrate_agents_to_new_structure(agents)
             print(f"✅ Loaded {len(self.agents)} real agents")
             
         except Exception as e:
@@ -255,244 +804,26 @@ class GraphVisualizer:
     
     def load_sample_data(self):
         """Load sample Project Eidolon data"""
-        # Agents (Thrones)
-        self.agents = [
-            {
-                "id": "skeptic",
-                "name": "ThroneOfTheSkeptic",
-                "agent": "The Skeptic",
-                "domain": "skeptic",
-                "authority_level": "triggered",
-                "current_strain": 0.0,
-                "max_strain": 1.0,
-                "is_active": True,
-                "keywords": ["logic", "validation", "skepticism"]
-            },
-            {
-                "id": "engineer",
-                "name": "ThroneOfTheEngineer", 
-                "agent": "The Engineer",
-                "domain": "engineer",
-                "authority_level": "triggered",
-                "current_strain": 0.0,
-                "max_strain": 1.0,
-                "is_active": True,
-                "keywords": ["mathematics", "proofs", "calculations", "how do i", "process", "method", "procedure"]
-            },
-            {
-                "id": "dreamer",
-                "name": "ThroneOfTheDreamer",
-                "agent": "The Dreamer", 
-                "domain": "dreamer",
-                "authority_level": "triggered",
-                "current_strain": 0.0,
-                "max_strain": 1.0,
-                "is_active": True,
-                "keywords": ["creativity", "imagination", "innovation"]
-            },
-            {
-                "id": "philosopher",
-                "name": "ThroneOfThePhilosopher",
-                "agent": "The Philosopher",
-                "domain": "philosopher", 
-                "authority_level": "triggered",
-                "current_strain": 0.0,
-                "max_strain": 1.0,
-                "is_active": True,
-                "keywords": ["wisdom", "ethics", "metaphysics"]
-            },
-            {
-                "id": "stage_manager",
-                "name": "ThroneOfTheStage_manager",
-                "agent": "The Stage Manager",
-                "domain": "stage_manager",
-                "authority_level": "triggered", 
-                "current_strain": 0.0,
-                "max_strain": 1.0,
-                "is_active": True,
-                "keywords": ["context", "coordination", "management"]
-            },
-            {
-                "id": "investigator",
-                "name": "ThroneOfTheInvestigator",
-                "agent": "The Investigator",
-                "domain": "investigator",
-                "authority_level": "triggered",
-                "current_strain": 0.0,
-                "max_strain": 1.0,
-                "is_active": True,
-                "keywords": ["research", "analysis", "discovery"]
-            },
-            {
-                "id": "archivist",
-                "name": "ThroneOfTheArchivist",
-                "agent": "The Archivist",
-                "domain": "archivist",
-                "authority_level": "triggered",
-                "current_strain": 0.0,
-                "max_strain": 1.0,
-                "is_active": True,
-                "keywords": ["memory", "storage", "retrieval"]
-            }
-        ]
-        
-        # Entities - Smallest units of knowledge for maximum connections
-        self.entities = [
-            {
-                "id": "pythagorean",
-                "name": "Pythagorean",
-                "entity_type": "concept_type",
-                "description": "Related to Pythagoras",
-                "strain_amplitude": 0.0,  # No cognitive dissonance initially
-                "node_resistance": 0.0,   # No incoming strain initially
-                "musical_frequency": 440,  # A4
-                "gravitational_mass": 1.0,
-                "access_count": 5,
-                "last_accessed": time.time()
-            },
-            {
-                "id": "theorem",
-                "name": "Theorem",
-                "entity_type": "concept_type", 
-                "description": "Mathematical statement proven true",
-                "strain_amplitude": 0.0,
-                "node_resistance": 0.0,
-                "musical_frequency": 493,  # B4
-                "gravitational_mass": 1.0,
-                "access_count": 3,
-                "last_accessed": time.time()
-            },
-            {
-                "id": "logical_rule", 
-                "name": "Modus Ponens",
-                "entity_type": "concept_type",
-                "description": "If P then Q, P, therefore Q",
-                "strain_amplitude": 0.92,
-                "strain_resistance": 0.1,
-                "strain_frequency": 8,
-                "access_count": 8
-            },
-            {
-                "id": "context_info",
-                "name": "Quantum Mechanics Context", 
-                "entity_type": "concept_type",
-                "description": "Physics domain context",
-                "strain_amplitude": 0.45,
-                "strain_resistance": 0.7,
-                "strain_frequency": 3,
-                "access_count": 3
-            },
-            {
-                "id": "creative_concept",
-                "name": "Neural Network Architecture",
-                "entity_type": "concept_type", 
-                "description": "AI system design",
-                "strain_amplitude": 0.23,
-                "strain_resistance": 0.9,
-                "strain_frequency": 1,
-                "access_count": 1
-            },
-            {
-                "id": "person",
-                "name": "Albert Einstein",
-                "entity_type": "person",
-                "description": "Theoretical physicist",
-                "strain_amplitude": 0.78,
-                "strain_resistance": 0.4,
-                "strain_frequency": 6,
-                "access_count": 6
-            },
-            {
-                "id": "place",
-                "name": "MIT",
-                "entity_type": "place",
-                "description": "Massachusetts Institute of Technology",
-                "strain_amplitude": 0.65,
-                "strain_resistance": 0.6,
-                "strain_frequency": 4,
-                "access_count": 4
-            },
-            {
-                "id": "event",
-                "name": "Quantum Revolution",
-                "entity_type": "event",
-                "description": "Early 20th century physics",
-                "strain_amplitude": 0.89,
-                "strain_resistance": 0.2,
-                "strain_frequency": 7,
-                "access_count": 7
-            }
-        ]
-        
-        # Authority Relationships
-        self.relationships = [
-            {
-                "id": "auth_engineer_mathematical_theorem",
-"from": "engineer",
-                "to": "mathematical_theorem",
-                "type": "has_authority",
-                "authority_strength": 0.9,
-                "strain_amplitude": 0.72
-            },
-            {
-                "id": "auth_skeptic_logical_rule",
-                "from": "skeptic", 
-                "to": "logical_rule",
-                "type": "has_authority",
-                "authority_strength": 0.95,
-                "strain_amplitude": 0.76
-            },
-            {
-                "id": "auth_stage_manager_context_info",
-                "from": "stage_manager",
-                "to": "context_info", 
-                "type": "has_authority",
-                "authority_strength": 0.7,
-                "strain_amplitude": 0.56
-            },
-            {
-                "id": "auth_dreamer_creative_concept",
-                "from": "dreamer",
-                "to": "creative_concept",
-                "type": "has_authority",
-                "authority_strength": 0.6,
-                "strain_amplitude": 0.48
-            },
-            {
-                "id": "auth_philosopher_person",
-                "from": "philosopher",
-                "to": "person",
-                "type": "has_authority", 
-                "authority_strength": 0.8,
-                "strain_amplitude": 0.64
-            },
-            {
-                "id": "auth_investigator_event",
-                "from": "investigator",
-                "to": "event",
-                "type": "has_authority",
-                "authority_strength": 0.85,
-                "strain_amplitude": 0.68
-            },
-            {
-                "id": "auth_archivist_place",
-                "from": "archivist",
-                "to": "place",
-                "type": "has_authority",
-                "authority_strength": 0.75,
-                "strain_amplitude": 0.60
-            }
-        ]
+        # Copy the module-level records so migration never mutates the shared constants
+        self.agents = self.migrate_agents_to_new_structure([dict(a) for a in _SAMPLE_AGENTS])
+        current_time = time.time()
+        self.entities = [dict(e, last_accessed=current_time) if 'last_accessed' in e else dict(e)
+                         for e in _SAMPLE_ENTITIES]
+        self.relationships = [dict(r) for r in _SAMPLE_RELATIONSHIPS]
     
     def get_graph_stats(self):
-        """Get graph statistics"""
+        """Get graph statistics as of the last snapshot"""
+        return self._stats
+    
+    def compute_graph_stats(self):
+        """Count agents, entities and relationships and the entities past each threshold"""
         return {
             "total_agents": len(self.agents),
             "total_entities": len(self.entities),
             "total_relationships": len(self.relationships),
-            "high_strain_entities": len([e for e in self.entities if e.get("strain_amplitude", 0.0) > 0.8]),
-            "low_resistance_entities": len([e for e in self.entities if e.get("node_resistance", 0.0) < 0.5]),
-            "high_frequency_entities": len([e for e in self.entities if e.get("musical_frequency", 0) > 500])
+            "high_strain_entities": int(np.count_nonzero(self.e_num['strain'] > 0.8)),
+            "low_resistance_entities": int(np.count_nonzero(self.e_num['resist'] < 0.5)),
+            "high_frequency_entities": int(np.count_nonzero(self.e_num['freq'] > 500))
         }
     
     def get_agents(self):
@@ -501,15 +832,27 @@ class GraphVisualizer:
     
     def get_entities(self, strain_threshold=None, entity_type=None):
         """Get entities with optional filtering"""
-        entities = self.entities
-        
-        if strain_threshold:
-            entities = [e for e in entities if e["strain_amplitude"] > strain_threshold]
-        
-        if entity_type:
-            entities = [e for e in entities if e["entity_type"] == entity_type]
+        if not strain_threshold and not entity_type:
+            return self.entities_view
         
-        return entities
+        with self.lock:
+            rows = None
+            
+            if strain_threshold:
+                # Strain changes every tick, so the sorted index is rebuilt lazily when stale
+                if self._strain_index_dirty:
+                    strain = self.e_num['strain']
+                    self._strain_order = np.argsort(strain, kind='stable')
+                    self._strain_sorted = strain[self._strain_order]
+                    self._strain_index_dirty = False
+                start = np.searchsorted(self._strain_sorted, strain_threshold, side='right')
+                rows = np.sort(self._strain_order[start:])
+            
+            if entity_type:
+                type_rows = self._by_type.get(entity_type, [])
+                rows = type_rows if rows is None else np.intersect1d(rows, type_rows)
+            
+            return [self.entities[i] for i in rows]
     
     def get_relationships(self, agent_id=None):
         """Get relationships with optional filtering"""
@@ -521,7 +864,11 @@ class GraphVisualizer:
         return relationships
     
     def get_all_nodes(self):
-        """Get all nodes (agents + entities) for graph visualization"""
+        """Get all nodes (agents + entities) for graph visualization, as of the last snapshot"""
+        return self._nodes_cache
+    
+    def build_nodes(self):
+        """Build the node view (agents + entities) from the current agent and entity dicts"""
         nodes = []
         
         # Add agents
@@ -553,138 +900,221 @@ class GraphVisualizer:
     def get_all_relationships(self):
         """Get all relationships for graph visualization"""
         return self.relationships
+    
+    def refresh_graph_cache(self):
+        """Serialize the current graph snapshot once so /api/graph-data can serve the bytes as-is"""
+        # The updater, the prompt worker and reloads all publish snapshots; build one at a time
+        with self.lock:
+            self.sync_entity_dicts()
+            # Bare attribute swaps are atomic under the GIL, so readers never see a partial snapshot
+            self.entities_view = tuple(self.entities)
+            self._nodes_cache = self.build_nodes()
+            self._graph_json_cache = json_dumps({
+                "nodes": self.get_all_nodes(),
+                "links": self.get_all_relationships()
+            })
+            self._stats = self.compute_graph_stats()
+            self._version += 1
+    
+    def get_graph_json(self):
+        """Get the serialized graph snapshot from the last update"""
+        return self._graph_json_cache
+
+def _entity_record(entity):
+    """Extract the numeric fields of an entity dict as a tuple in ENTITY_DTYPE field order"""
+    return (
+        entity['access_count'],
+        entity['last_accessed'],
+        entity['strain_amplitude'],
+        entity['gravitational_mass'],
+        entity['node_resistance'],
+        entity['musical_frequency'],
+    )
+
+@lru_cache(maxsize=4096)
+def _iso_to_ts(value):
+    """Parse an ISO date string to a float timestamp; data files repeat the same few dates a lot"""
+    return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+
+def _to_timestamp(value, default):
+    """Convert a float timestamp or ISO date string to a float timestamp"""
+    if isinstance(value, str):
+        try:
+            return _iso_to_ts(value)
+        except ValueError:
+            return default
+    return float(value)
+
+# Initialize the visualizer; data is loaded off the startup path once the SSE machinery below exists
+visualizer = GraphVisualizer(load=False)
 
-# Initialize the visualizer
-visualizer = GraphVisualizer()
+# Real-time update system: one bounded event buffer per connected SSE client
+SUBSCRIBER_QUEUE_SIZE = 1024
+# Most events coalesced into one SSE frame per wakeup
+SSE_BATCH_SIZE = 64
 
-# Real-time update system
-update_queue = queue.Queue()
+class Subscriber:
+    """Event buffer for one SSE client: producers append serialized events and signal, the client's generator drains"""
+    def __init__(self, maxlen=SUBSCRIBER_QUEUE_SIZE):
+        # deque append/popleft are atomic under the GIL; a full buffer drops its oldest event
+        self.events = deque(maxlen=maxlen)
+        self.ready = threading.Event()
+        # Set when events were dropped, so the client can be told it lagged
+        self.overflowed = False
+    
+    def put(self, event):
+        """Queue a serialized event and wake the client"""
+        if len(self.events) == self.events.maxlen:
+            self.overflowed = True
+        self.events.append(event)
+        self.ready.set()
+    
+    def drain(self, timeout, limit=SSE_BATCH_SIZE):
+        """Wait up to timeout seconds for events and return up to limit of them; empty when the wait timed out"""
+        if not self.ready.wait(timeout):
+            return []
+        # Clear before draining so an event appended meanwhile re-arms the event instead of being missed
+        self.ready.clear()
+        events = []
+        if self.overflowed:
+            self.overflowed = False
+            events.append(json_dumps({'type': 'overflow', 'timestamp': time.time()}))
+        while self.events and len(events) < limit:
+            events.append(self.events.popleft())
+        if self.events:
+            # More than one batch was waiting; make the next drain return immediately
+            self.ready.set()
+        return events
+
+subscribers = set()
+subscribers_lock = threading.Lock()
 last_update_time = time.time()
+# Wakes the background updater early, e.g. right after a data refresh
+tick_event = threading.Event()
+
+def subscribe():
+    """Register a new SSE client and return its frame buffer"""
+    subscriber = Subscriber()
+    with subscribers_lock:
+        subscribers.add(subscriber)
+    return subscriber
+
+def unsubscribe(subscriber):
+    """Remove a disconnected SSE client"""
+    with subscribers_lock:
+        subscribers.discard(subscriber)
+
+# SSE frames are built as bytes end to end; nothing on the stream path is decoded to str
+_SSE_PREFIX = b"data: "
+_SSE_SUFFIX = b"\n\n"
+
+_SSE_BATCH_OPEN = b'{"type":"batch","events":['
+# An SSE comment: keeps proxies from closing an idle stream without firing a client event
+_SSE_PING = b": ping\n\n"
+# Seconds a stream may sit idle before a ping; under the common 30 s proxy idle timeout
+SSE_PING_INTERVAL = 25
+_SSE_BATCH_CLOSE = b']}'
+
+def sse_frame(update):
+    """Serialize an update into a complete SSE 'data:' frame"""
+    return _SSE_PREFIX + json_dumps(update) + _SSE_SUFFIX
+
+def sse_batch_frame(events):
+    """Wrap serialized events in one SSE frame; several become a {"type": "batch", "events": [...]} message"""
+    if len(events) == 1:
+        return _SSE_PREFIX + events[0] + _SSE_SUFFIX
+    # The events are already JSON, so the batch envelope is spliced around them rather than re-encoded
+    return _SSE_PREFIX + _SSE_BATCH_OPEN + b','.join(events) + _SSE_BATCH_CLOSE + _SSE_SUFFIX
+
+def broadcast(update):
+    """Serialize an update once and send it to every connected SSE client"""
+    event = json_dumps(update)
+    with subscribers_lock:
+        client_subscribers = list(subscribers)
+    for subscriber in client_subscribers:
+        subscriber.put(event)
+
+def data_reloaded():
+    """Tell SSE clients that reloaded data has been swapped in, and tick right away so values follow"""
+    broadcast({'type': 'reloaded', 'timestamp': time.time()})
+    tick_event.set()
+
+visualizer.load_in_background(on_loaded=data_reloaded)
 
 def background_updater():
     """Background thread for real-time updates"""
     global last_update_time
     while True:
         try:
-            # Simulate real-time updates every 2 seconds
-            time.sleep(2)
+            # Simulate real-time updates every 2 seconds, or sooner when tick_event is set
+            tick_event.wait(2.0)
+            tick_event.clear()
             current_time = time.time()
             
             # Update gravitational masses based on access patterns
+            # last_accessed is normalized to a float timestamp when agents are loaded
             for agent in visualizer.agents:
-                # Initialize missing fields for gravity calculations
-                if 'gravitational_mass' not in agent:
-                    agent['gravitational_mass'] = 1.0
-                if 'last_accessed' not in agent:
-                    agent['last_accessed'] = current_time
-                if 'access_count' not in agent:
-                    agent['access_count'] = 1
-                
-                # Simulate gravitational mass changes
-                current_mass = agent['gravitational_mass']
-                
-                # Handle date conversion for agents
-                try:
-                    if isinstance(agent['last_accessed'], str):
-                        # Try to parse ISO date string
-                        import datetime
-                        try:
-                            parsed_date = datetime.datetime.fromisoformat(agent['last_accessed'].replace('Z', '+00:00'))
-                            last_access = parsed_date.timestamp()
-                        except:
-                            # If parsing fails, use current time
-                            last_access = current_time
-                    else:
-                        last_access = float(agent['last_accessed'])
-                except:
-                    last_access = current_time
-                
-                time_since_access = current_time - last_access
-                access_count = int(agent['access_count'])
+                time_since_access = current_time - agent['last_accessed']
                 
                 # Calculate new gravitational mass using gravity formula
                 time_factor = 1.0 + (1.0 / max(time_since_access, 1.0))
-                new_mass = 1.0 * access_count * time_factor
-                agent['gravitational_mass'] = new_mass
+                agent['gravitational_mass'] = 1.0 * agent['access_count'] * time_factor
                 agent['last_accessed'] = current_time
             
-            for entity in visualizer.entities:
-                # Initialize missing fields for gravity calculations
-                if 'gravitational_mass' not in entity:
-                    entity['gravitational_mass'] = 1.0
-                if 'last_accessed' not in entity:
-                    entity['last_accessed'] = current_time
-                if 'access_count' not in entity:
-                    entity['access_count'] = 1
-                if 'strain_amplitude' not in entity:
-                    entity['strain_amplitude'] = 0.0
-                if 'node_resistance' not in entity:
-                    entity['node_resistance'] = 0.0
-                if 'musical_frequency' not in entity:
-                    entity['musical_frequency'] = 440  # Default to A4
-                
-                # Handle date conversion for last_accessed
-                try:
-                    if isinstance(entity['last_accessed'], str):
-                        # Try to parse ISO date string
-                        import datetime
-                        try:
-                            parsed_date = datetime.datetime.fromisoformat(entity['last_accessed'].replace('Z', '+00:00'))
-                            last_access = parsed_date.timestamp()
-                        except:
-                            # If parsing fails, use current time
-                            last_access = current_time
-                    else:
-                        last_access = float(entity['last_accessed'])
-                except:
-                    last_access = current_time
-                
-                # Update gravitational mass
-                current_mass = entity['gravitational_mass']
-                time_since_access = current_time - last_access
-                access_count = int(entity['access_count'])
-                
-                # Calculate new gravitational mass
-                time_factor = 1.0 + (1.0 / max(time_since_access, 1.0))
-                new_mass = 1.0 * access_count * time_factor
-                entity['gravitational_mass'] = new_mass
-                entity['last_accessed'] = current_time
-                
-                # Update node resistance as summed strain amplitudes
-                # Simulate incoming strain from connections
-                incoming_strains = [entity['strain_amplitude']]  # Self-strain
-                total_resistance = sum(incoming_strains)
-                entity['node_resistance'] = total_resistance
-                
-                # Decay cognitive dissonance over time (strain only exists when there's contradiction)
-                current_strain = entity['strain_amplitude']
-                if current_strain > 0.0:
-                    # Simulate 5% chance of new contradiction detection
-                    if random.random() < 0.05:
-                        dissonance = random.uniform(0.1, 0.2)
-                        entity['strain_amplitude'] = current_strain + dissonance
-                    else:
-                        # Decay existing strain
-                        entity['strain_amplitude'] = max(0.0, current_strain * 0.98)
+            visualizer.update_entity_gravity(current_time)
             
             last_update_time = current_time
-            update_queue.put({
+            visualizer.refresh_graph_cache()
+            # Only send what changes each tick: [id, gravitational_mass, strain] per node
+            broadcast({
                 'type': 'update',
                 'timestamp': current_time,
                 'data': {
-                    'agents': visualizer.agents,
-                    'entities': visualizer.entities
+                    'agents': [[a['id'], a['gravitational_mass'], a['current_strain']] for a in visualizer.agents],
+                    'entities': [[e['id'], e['gravitational_mass'], e['strain_amplitude']] for e in visualizer.entities_view]
                 }
             })
             
         except Exception as e:
             print(f"Background updater error: {e}")
-            time.sleep(5)
+            tick_event.wait(5.0)
 
 # Start background updater thread
 updater_thread = threading.Thread(target=background_updater, daemon=True)
 updater_thread.start()
 
+# Prompts are processed one at a time off the request thread, each under visualizer.lock
+PROMPT_QUEUE_SIZE = 256
+prompt_queue = queue.Queue(maxsize=PROMPT_QUEUE_SIZE)
+
+def prompt_worker():
+    """Background thread that processes queued prompts and sends the results to SSE clients"""
+    while True:
+        prompt_id, prompt = prompt_queue.get()
+        try:
+            # Simulate prompt processing
+            # In a real implementation, this would connect to the Project Eidolon system
+            response = process_prompt(prompt)
+            visualizer.refresh_graph_cache()
+            
+            # Send the prompt and response to connected clients
+            broadcast({
+                'type': 'prompt_response',
+                'timestamp': time.time(),
+                'data': {
+                    'id': prompt_id,
+                    'prompt': prompt,
+                    'response': response,
+                    'new_entities': response.get('new_entities', []),
+                    'new_relationships': response.get('new_relationships', [])
+                }
+            })
+        except Exception as e:
+            print(f"Prompt worker error: {e}")
+
+prompt_thread = threading.Thread(target=prompt_worker, daemon=True)
+prompt_thread.start()
+
 @app.route('/')
 def index():
     """Main dashboard"""
@@ -694,117 +1124,162 @@ def index():
 @app.route('/api/stats')
 def api_stats():
     """API endpoint for graph statistics"""
-    return jsonify(visualizer.get_graph_stats())
+    return json_response(visualizer.get_graph_stats())
+
+# Snapshot versions restart at 0 with every server process; the boot id keeps an ETag handed out
+# by an earlier process from matching a version number that now labels different data
+BOOT_ID = uuid.uuid4().hex
+
+def snapshot_etag():
+    """ETag for the current graph snapshot, unique to this server process"""
+    return f"{BOOT_ID}-{visualizer._version}"
+
+def not_modified(etag):
+    """304 response that repeats the validator the client matched"""
+    response = Response(status=304)
+    response.set_etag(etag)
+    return response
+
+def snapshot_response(build):
+    """JSON bytes from build() with the snapshot ETag; 304 without building them when the client has this snapshot"""
+    # Read the version before the payload so the ETag never claims a newer snapshot than the body
+    etag = snapshot_etag()
+    if etag in request.if_none_match:
+        return not_modified(etag)
+    
+    response = Response(build(), mimetype='application/json')
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+def content_etag_response(build):
+    """JSON response whose ETag is a digest of the body; 304 when the client already has exactly these bytes"""
+    # For bodies that outlive snapshots: relationships only change on load or prompt, so a digest matches
+    # across ticks and server restarts. Tick-driven bodies (agents, entities) use snapshot_response instead,
+    # which skips the serialization on a match
+    body = json_dumps(build())
+    etag = hashlib.blake2b(body, digest_size=16).hexdigest()
+    if etag in request.if_none_match:
+        return not_modified(etag)
+    
+    response = Response(body, mimetype='application/json')
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
 
 @app.route('/api/agents')
 def api_agents():
     """API endpoint for agents"""
-    return jsonify(visualizer.get_agents())
+    return snapshot_response(lambda: json_dumps(visualizer.get_agents()))
 
 @app.route('/api/entities')
 def api_entities():
     """API endpoint for entities"""
     strain_threshold = request.args.get('strain_threshold', type=float)
     entity_type = request.args.get('entity_type')
-    entities = visualizer.get_entities(strain_threshold, entity_type)
-    return jsonify(entities)
+    return snapshot_response(lambda: json_dumps(visualizer.get_entities(strain_threshold, entity_type)))
 
 @app.route('/api/relationships')
 def api_relationships():
     """API endpoint for relationships"""
     agent_id = request.args.get('agent_id')
-    relationships = visualizer.get_relationships(agent_id)
-    return jsonify(relationships)
+    return content_etag_response(lambda: visualizer.get_relationships(agent_id))
 
 @app.route('/api/refresh')
 def api_refresh():
     """API endpoint to refresh data from the system"""
     try:
-        visualizer.load_real_data()
-        return jsonify({
-            "status": "success",
-            "message": "Data refreshed successfully",
-            "stats": visualizer.get_graph_stats()
+        # Clients get a 'reloaded' event once the new data is in and reload the graph then
+        visualizer.load_in_background(on_loaded=data_reloaded)
+        return json_response({
+            "status": "scheduled",
+            "message": "Data refresh scheduled"
         })
     except Exception as e:
-        return jsonify({
+        return json_response({
             "status": "error",
             "message": f"Error refreshing data: {str(e)}"
-        }), 500
+        }, 500)
 
 @app.route('/api/graph-data')
 def api_graph_data():
     """API endpoint to get complete graph data for the canvas"""
-    return jsonify({
-        "nodes": visualizer.get_all_nodes(),
-        "links": visualizer.get_all_relationships()
-    })
+    return snapshot_response(visualizer.get_graph_json)
 
+@app.route('/api/stream')
 @app.route('/api/stream-updates')
 def api_stream_updates():
     """Server-sent events endpoint for real-time updates"""
     def generate():
-        while True:
-            try:
-                # Wait for updates with timeout
+        subscriber = subscribe()
+        try:
+            while True:
                 try:
-                    update = update_queue.get(timeout=5)
-                    yield f"data: {json.dumps(update)}\n\n"
-                except queue.Empty:
-                    # Send heartbeat
-                    yield f"data: {json.dumps({'type': 'heartbeat', 'timestamp': time.time()})}\n\n"
-            except Exception as e:
-                print(f"Stream error: {e}")
-                break
+                    # Wait for updates with timeout; events arrive already serialized by broadcast()
+                    events = subscriber.drain(timeout=SSE_PING_INTERVAL)
+                    if events:
+                        # Everything queued since the last wakeup goes out as one frame
+                        yield sse_batch_frame(events)
+                    else:
+                        # Send heartbeat
+                        yield _SSE_PING
+                except Exception as e:
+                    print(f"Stream error: {e}")
+                    break
+        finally:
+            unsubscribe(subscriber)
     
-    return Response(generate(), mimetype='text/event-stream')
+    # generate() only yields bytes, so Werkzeug can hand them to the WSGI server untouched
+    return Response(generate(), mimetype='text/event-stream', direct_passthrough=True)
 
 @app.route('/api/process-prompt', methods=['POST'])
 def api_process_prompt():
     """API endpoint to process user prompts and update the graph"""
     try:
-        data = request.get_json()
+        data = json_loads(request.get_data())
         prompt = data.get('prompt', '').strip()
         
         if not prompt:
-            return jsonify({
+            return json_response({
                 'status': 'error',
                 'message': 'No prompt provided'
-            }), 400
+            }, 400)
         
-        # Simulate prompt processing
-        # In a real implementation, this would connect to the Project Eidolon system
-        response = process_prompt(prompt)
+        # The result is delivered as a prompt_response SSE event carrying this id
+        prompt_id = uuid.uuid4().hex
+        try:
+            prompt_queue.put_nowait((prompt_id, prompt))
+        except queue.Full:
+            return json_response({
+                'status': 'error',
+                'message': 'Too many prompts queued, try again shortly'
+            }, 503)
         
-        # Add the prompt and response to the update queue
-        update_queue.put({
-            'type': 'prompt_response',
-            'timestamp': time.time(),
-            'data': {
-                'prompt': prompt,
-                'response': response,
-                'new_entities': response.get('new_entities', []),
-                'new_relationships': response.get('new_relationships', [])
-            }
-        })
-        
-        return jsonify({
-            'status': 'success',
-            'message': 'Prompt processed successfully',
-            'response': response
-        })
+        return json_response({
+            'status': 'accepted',
+            'message': 'Prompt queued for processing',
+            'id': prompt_id
+        }, 202)
         
     except Exception as e:
-        return jsonify({
+        return json_response({
             'status': 'error',
             'message': f'Error processing prompt: {str(e)}'
-        }), 500
+        }, 500)
+
+# Common words that don't add semantic value as word nodes
+_STOPWORDS = frozenset({'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by'})
 
 def process_prompt(prompt):
     """Process a user prompt and return response with new graph elements"""
+    # Rows from find_entity() and the new-entity offsets index one set of entity arrays; holding the lock
+    # for the whole prompt makes a background reload wait rather than swap the arrays out mid-prompt
+    with visualizer.lock:
+        return _process_prompt(prompt)
+
+def _process_prompt(prompt):
+    """Body of process_prompt; the caller holds visualizer.lock"""
     # Simulate AI processing
-    import random
-    
     # Generate a mock response based on the prompt
     response = {
         'processed_prompt': prompt,
@@ -817,19 +1292,26 @@ def process_prompt(prompt):
     # Extract individual words from prompt for granular node creation
     words = prompt.lower().split()
     current_time = time.time()
+    # One frequency per word, drawn up front; C4 to B4 range
+    frequencies = rng.integers(261, 494, size=len(words)).tolist()
+    # New word nodes by name; they are appended together after the loop so the arrays are copied once
+    pending = {}
     
     # Create individual word nodes (smallest units of knowledge)
-    for word in words:
+    for word, frequency in zip(words, frequencies):
         # Skip common words that don't add semantic value
-        if word in ['the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by']:
+        if word in _STOPWORDS:
             continue
             
         # Check if word node already exists
-        existing_entity = next((e for e in visualizer.entities if e['name'].lower() == word), None)
-        if existing_entity:
+        existing_index = visualizer.find_entity(word)
+        if existing_index is not None:
             # Update access count and last accessed time
-            existing_entity['access_count'] += 1
-            existing_entity['last_accessed'] = current_time
+            visualizer.record_access(existing_index, current_time)
+            continue
+        if word in pending:
+            # Repeated in this prompt; last_accessed is already current_time
+            pending[word]['access_count'] += 1
             continue
         
         # Create new word node
@@ -840,49 +1322,55 @@ def process_prompt(prompt):
             'description': f'Word: {word}',
             'strain_amplitude': 0.0,  # No cognitive dissonance initially
             'node_resistance': 0.0,   # No incoming strain initially
-            'musical_frequency': random.randint(261, 493),  # C4 to B4 range
+            'musical_frequency': frequency,
             'gravitational_mass': 1.0,  # Base mass
             'access_count': 1,
             'last_accessed': current_time
         }
         response['new_entities'].append(new_entity)
-        
-        # Add to visualizer
-        visualizer.entities.append(new_entity)
+        pending[word] = new_entity
+    
+    # Add to visualizer
+    visualizer.add_entities(list(pending.values()), names_lc=list(pending))
     
     # Simulate background agents creating connections between related concepts
     # This is where the exponential growth of connections happens
-    for i, entity1 in enumerate(visualizer.entities[-len(words):]):  # New entities
-        for j, entity2 in enumerate(visualizer.entities):
-            if i != j and random.random() < 0.1:  # 10% chance of connection
-                # Simulate semantic similarity detection
-                relationship = {
-                    'id': f'rel_{entity1["id"]}_{entity2["id"]}',
-                    'from_entity': entity1['id'],
-                    'to_entity': entity2['id'],
-                    'relationship_type': 'semantic_similarity',
-                    'strength': random.uniform(0.1, 0.9)
-                }
-                response['new_relationships'].append(relationship)
+    # Each (new entity, entity) pair connects with a 10% chance; rather than rolling once per pair,
+    # draw how many pairs connect and then which ones, in pair order
+    entities = visualizer.entities
+    n = len(entities)
+    w = min(len(words), n)  # New entities are the last len(words) rows
+    pairs = np.sort(rng.choice(w * n, size=rng.binomial(w * n, 0.1), replace=False))
+    sources, targets = np.divmod(pairs, n)
+    connected = sources != targets  # Position in the new-entity slice vs. row, as before
+    strengths = rng.uniform(0.1, 0.9, np.count_nonzero(connected))
+    for i, j, strength in zip((sources[connected] + (n - w)).tolist(), targets[connected].tolist(), strengths.tolist()):
+        entity1 = entities[i]
+        entity2 = entities[j]
+        # Simulate semantic similarity detection
+        response['new_relationships'].append({
+            'id': f'rel_{entity1["id"]}_{entity2["id"]}',
+            'from_entity': entity1['id'],
+            'to_entity': entity2['id'],
+            'relationship_type': 'semantic_similarity',
+            'strength': strength
+        })
     
     # Simulate cognitive dissonance detection (only when contradictions exist)
-    for entity in visualizer.entities[:5]:  # Check first 5 entities
-        old_strain = entity.get('strain_amplitude', 0.0)
-        
-        # Only create strain if there's contradictory information
-        # Simulate contradiction detection (5% chance)
-        if random.random() < 0.05:
-            dissonance = random.uniform(0.1, 0.2)  # Small cognitive dissonance
-            entity['strain_amplitude'] = old_strain + dissonance
-            response['strain_changes'].append({
-                'entity_id': entity['id'],
-                'old_strain': old_strain,
-                'new_strain': entity['strain_amplitude'],
-                'reason': 'cognitive dissonance detected'
-            })
-        else:
-            # Decay existing strain over time
-            entity['strain_amplitude'] = max(0.0, old_strain * 0.98)
+    checked = min(5, len(visualizer.entities))  # Check first 5 entities
+    # Simulate contradiction detection (5% chance) with a small cognitive dissonance
+    rand01 = rng.random(checked)
+    contradictions = rand01 < 0.05
+    dissonances = rng.uniform(0.1, 0.2, checked)
+    # Only create strain if there's contradictory information; decay existing strain otherwise
+    old_strains, new_strains = visualizer.apply_dissonance(checked, rand01, dissonances)
+    for index in np.flatnonzero(contradictions).tolist():
+        response['strain_changes'].append({
+            'entity_id': visualizer.entities[index]['id'],
+            'old_strain': float(old_strains[index]),
+            'new_strain': float(new_strains[index]),
+            'reason': 'cognitive dissonance detected'
+        })
     
     return response
 
@@ -914,21 +1402,30 @@ def graph_canvas_page():
 import socket
 
 def find_free_port(start_port=5000, max_attempts=100):
-    """Find an available port starting from start_port"""
-    for port in range(start_port, start_port + max_attempts):
-        try:
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                s.bind(('localhost', port))
-                return port
-        except OSError:
-            continue
-    raise RuntimeError(f"Could not find a free port in range {start_port}-{start_port + max_attempts}")
+    """Find an available port by letting the kernel pick one
+    
+    start_port and max_attempts are kept for existing callers but are no longer used.
+    """
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(('localhost', 0))
+        return s.getsockname()[1]
 
 if __name__ == '__main__':
+    if '--compress-data' in sys.argv:
+        # Write compressed copies of the knowledge files for faster loading
+        for name in ('comprehensive_knowledge_ai_enhanced.json', 'comprehensive_knowledge.json', 'sample_data.json'):
+            path = os.path.join(os.path.dirname(__file__), name)
+            if os.path.exists(path):
+                print(f"Compressed {name} -> {os.path.basename(compress_data_file(path))}")
+        sys.exit(0)
+    
     print("Starting Project Eidolon Graph Visualizer...")
     
     # Use a fixed port for consistency
     port = 5002
     print(f"Starting on port: {port}")
     print(f"Open http://localhost:{port} in your browser")
-    app.run(debug=True, host='0.0.0.0', port=port) 
\ No newline at end of file
+    # The debugger and reloader are opt-in (EIDOLON_DEBUG=1); for deployment use gunicorn.conf.py.
+    # threaded=True keeps long-lived SSE streams from blocking the other endpoints.
+    debug = os.environ.get('EIDOLON_DEBUG') == '1'
+    app.run(debug=debug, use_reloader=debug, threaded=True, host='0.0.0.0', port=port) 
\ No newline at end of file
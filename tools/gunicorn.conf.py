@@ -0,0 +1,24 @@
+"""
+Gunicorn configuration for the Project Eidolon Graph Visualizer
+
+Usage (from the tools directory):
+    gunicorn -c gunicorn.conf.py graph_visualizer:app
+"""
+
+import os
+
+bind = f"0.0.0.0:{os.environ.get('EIDOLON_PORT', '5002')}"
+
+# The background updater, the SSE subscriber queues and prompt writes all live in
+# the process that imports graph_visualizer, so the graph must stay in one worker.
+# Concurrency comes from threads instead: each request or SSE stream gets its own.
+workers = 1
+worker_class = 'gthread'
+threads = int(os.environ.get('EIDOLON_THREADS', '16'))
+
+# Import the app inside the worker, not the master, so the updater thread is not
+# lost when gunicorn forks
+preload_app = False
+
+# SSE connections are long-lived; the gthread worker heartbeats independently of them
+keepalive = 5
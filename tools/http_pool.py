@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP Connection Pool for Project Eidolon Tools
+One keep-alive requests.Session for the knowledge base API and AI provider endpoints
+"""
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+POOL_CONNECTIONS = 8   # distinct hosts kept open
+POOL_MAXSIZE = 32      # connections per host, enough for the threaded agent fan-out
+
+def create_session() -> requests.Session:
+    """Session that reuses connections and retries transient connection failures"""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=POOL_CONNECTIONS,
+        pool_maxsize=POOL_MAXSIZE,
+        max_retries=Retry(total=2, backoff_factor=0.1),
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+SESSION = create_session()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Knowledge Base Cache for Project Eidolon
+Keeps knowledge base API responses on disk and revalidates them with ETag / If-None-Match
+"""
+
+import hashlib
+import json
+import os
+from typing import Any, Dict, Optional
+
+import requests
+
+from http_pool import SESSION
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib json module
+    orjson = None
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'eidolon', 'kb')
+
+def json_loads(raw: bytes) -> Any:
+    """Decode JSON bytes, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+class KnowledgeBaseCache:
+    """Disk cache of JSON GET responses keyed by URL, revalidated on every fetch"""
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, session: Optional[requests.Session] = None):
+        os.makedirs(cache_dir, exist_ok=True)
+        self.cache_dir = cache_dir
+        self.session = session or SESSION
+        self.hits = 0
+        self.misses = 0
+
+    def _paths(self, url: str):
+        """Body and validator file paths for a URL"""
+        base = os.path.join(self.cache_dir, hashlib.sha1(url.encode('utf-8')).hexdigest())
+        return base + '.json', base + '.meta'
+
+    def _read_validators(self, meta_path: str) -> Dict[str, str]:
+        """Stored ETag / Last-Modified for a cached body, empty if there is none"""
+        try:
+            with open(meta_path, 'rb') as f:
+                return json_loads(f.read())
+        except (OSError, ValueError):
+            return {}
+
+    def _write(self, body_path: str, meta_path: str, body: bytes, validators: Dict[str, str]):
+        """Store a body and its validators, replacing each file atomically"""
+        for path, data in ((body_path, body), (meta_path, json.dumps(validators).encode('utf-8'))):
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+
+    def get_json(self, url: str) -> Any:
+        """GET url as JSON, answering from disk when the server replies 304 Not Modified for the stored ETag"""
+        body_path, meta_path = self._paths(url)
+        validators = self._read_validators(meta_path) if os.path.exists(body_path) else {}
+
+        headers = {}
+        if validators.get('etag'):
+            headers['If-None-Match'] = validators['etag']
+        if validators.get('last_modified'):
+            headers['If-Modified-Since'] = validators['last_modified']
+
+        response = self.session.get(url, headers=headers)
+        if response.status_code == 304 and validators:
+            # Only trust a 304 that names the validator we sent (or names none); anything else means the
+            # server is talking about a different body, so fetch it again without conditions
+            etag = response.headers.get('ETag')
+            if etag is None or etag == validators.get('etag'):
+                self.hits += 1
+                with open(body_path, 'rb') as f:
+                    return json_loads(f.read())
+            response = self.session.get(url)
+
+        response.raise_for_status()
+        self.misses += 1
+        validators = {
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+        }
+        if validators['etag'] or validators['last_modified']:
+            self._write(body_path, meta_path, response.content, validators)
+        return json_loads(response.content)
+
+    def wrap(self, ai_system):
+        """Route an AgentAISystem's knowledge base requests through this cache"""
+        ai_system.fetch_json = self.get_json
+        return ai_system
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Exact-Match Response Cache for Project Eidolon AI Providers
+Persists AI responses keyed on a SHA-256 of (provider, agent, normalized query)
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Iterable, Optional
+
+from response_cache import ResponseCache, Scope
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'eidolon', 'llm_exact.sqlite')
+
+# Queries whose answer depends on when they are asked are never cached
+DEFAULT_EXCLUDE_PATTERNS = (r'\bnow\b', r'\btoday\b', r'\btomorrow\b', r'\byesterday\b', r'\blatest\b')
+
+def cache_key(provider: str, agent: str, query: str) -> str:
+    """Stable cache key for a query to one agent of one provider"""
+    payload = json.dumps({"p": provider, "a": agent, "q": query.strip().lower()}, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+class SQLiteBackend:
+    """Response store in a single SQLite table, safe to share between threads"""
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, response TEXT, ts INTEGER)"
+        )
+        self._conn.commit()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, ttl: float) -> Optional[str]:
+        """Return the stored response for key if it is younger than ttl seconds"""
+        with self._lock:
+            row = self._conn.execute("SELECT response, ts FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None or time.time() - row[1] > ttl:
+            return None
+        return row[0]
+
+    def set(self, key: str, response: str):
+        """Store or replace the response for key"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, response, ts) VALUES (?, ?, ?)",
+                (key, response, int(time.time())),
+            )
+            self._conn.commit()
+
+class ExactCache(ResponseCache):
+    """Exact-match cache in front of an AI system's response methods"""
+
+    def __init__(self, backend=None, ttl: float = 3600, exclude_patterns: Iterable[str] = DEFAULT_EXCLUDE_PATTERNS):
+        super().__init__()
+        self.backend = backend or SQLiteBackend()
+        self.ttl = ttl
+        self.exclude = [re.compile(pattern, re.IGNORECASE) for pattern in exclude_patterns]
+
+    def _excluded(self, query: str) -> bool:
+        """Whether query matches one of the never-cache patterns"""
+        return any(pattern.search(query) for pattern in self.exclude)
+
+    def _prepare(self, query: str) -> Optional[str]:
+        """The query itself, or None if it matches a never-cache pattern"""
+        return None if self._excluded(query) else query
+
+    def _get(self, scope: Scope, query: str) -> Optional[str]:
+        """Stored response for this exact query to scope's provider and agent, if younger than the TTL"""
+        return self.backend.get(cache_key(*scope, query), self.ttl)
+
+    def _put(self, scope: Scope, query: str, response: str):
+        """Store the response for this exact query to scope's provider and agent"""
+        self.backend.set(cache_key(*scope, query), response)
@@ -7,6 +7,11 @@ import json
 import os
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib json module
+    orjson = None
+
 def populate_real_data():
     """Create sample data file for the graph visualizer"""
     
@@ -229,8 +234,12 @@ def populate_real_data():
     }
     
     data_file = os.path.join(os.path.dirname(__file__), 'sample_data.json')
-    with open(data_file, 'w') as f:
-        json.dump(data, f, indent=2)
+    if orjson is not None:
+        with open(data_file, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE))
+    else:
+        with open(data_file, 'w') as f:
+            json.dump(data, f, indent=2)
     
     print(f"✅ Created {len(entities)} entities")
     print(f"✅ Created {len(relationships)} relationships")
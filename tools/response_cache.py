@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Response Cache Base for Project Eidolon AI Providers
+Lookup, miss-filling and AgentAISystem wrapping shared by the exact-match and semantic caches
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from cursor_ai_integration import is_error_response
+
+# (provider and knowledge base, agent id or 'coordinated')
+Scope = Tuple[str, str]
+
+class ResponseCache:
+    """Base for caches in front of an AI system's response methods
+
+    Subclasses say how a query is prepared for lookup and how responses are read and stored; preparing
+    once lets a query shared by several agents be normalized or embedded a single time.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+    def _prepare(self, query: str) -> Optional[Any]:
+        """Lookup form of query, or None if it must never be cached"""
+        raise NotImplementedError
+
+    def _get(self, scope: Scope, prepared: Any) -> Optional[str]:
+        """Stored response for a prepared query in scope, or None"""
+        raise NotImplementedError
+
+    def _put(self, scope: Scope, prepared: Any, response: str):
+        """Store the response for a prepared query in scope"""
+        raise NotImplementedError
+
+    def _remember(self, scope: Scope, prepared: Any, response: str):
+        """Store a response unless it is a failure string, which would otherwise be replayed until it expires"""
+        if not is_error_response(response):
+            self._put(scope, prepared, response)
+
+    def cached(self, scope: Scope, query: str, compute: Callable[[], str]) -> str:
+        """Return the stored response for query, or compute and store one"""
+        prepared = self._prepare(query)
+        if prepared is None:
+            return compute()
+        response = self._get(scope, prepared)
+        if response is not None:
+            self.hits += 1
+            return response
+        self.misses += 1
+        response = compute()
+        self._remember(scope, prepared, response)
+        return response
+
+    def cached_batch(self, scope: Scope, queries: List[str],
+                     compute: Callable[[List[str]], List[str]]) -> List[str]:
+        """Look up several queries in one scope; compute(missing queries) fills the misses in one call"""
+        # Uncacheable queries are always computed, never stored, and not counted
+        prepared = [self._prepare(query) for query in queries]
+        responses = [self._get(scope, p) if p is not None else None for p in prepared]
+        missing = [i for i, response in enumerate(responses) if response is None]
+        self.hits += len(responses) - len(missing)
+        self.misses += sum(1 for i in missing if prepared[i] is not None)
+        if missing:
+            computed = compute([queries[i] for i in missing])
+            for i, response in zip(missing, computed):
+                if prepared[i] is not None:
+                    self._remember(scope, prepared[i], response)
+                responses[i] = response
+        return responses
+
+    def cached_many(self, scopes: Dict[str, Scope], query: str,
+                    compute: Callable[[List[str]], Dict[str, str]]) -> Dict[str, str]:
+        """Look up query in several scopes at once; compute(missing keys) fills the misses in one call"""
+        prepared = self._prepare(query)
+        if prepared is None:
+            return compute(list(scopes))
+        responses = {key: self._get(scope, prepared) for key, scope in scopes.items()}
+        missing = [key for key, response in responses.items() if response is None]
+        self.hits += len(responses) - len(missing)
+        self.misses += len(missing)
+        if missing:
+            computed = compute(missing)
+            for key in missing:
+                self._remember(scopes[key], prepared, computed[key])
+                responses[key] = computed[key]
+        return responses
+
+    def wrap(self, ai_system):
+        """Route get_agent_response, get_multi_agent_response, get_coordinated_response and
+        get_coordinated_responses_batch of an AgentAISystem through this cache"""
+        # Scope entries to the provider and the knowledge base they were answered from; look both up per call
+        # so reloading the knowledge base (after a prompt or a refresh) starts a fresh scope
+        def provider() -> str:
+            return f"{type(ai_system.provider).__name__}@{ai_system.knowledge_digest}"
+
+        get_agent_response = ai_system.get_agent_response
+        get_coordinated_response = ai_system.get_coordinated_response
+        get_multi_agent_response = ai_system.get_multi_agent_response
+        get_coordinated_responses_batch = ai_system.get_coordinated_responses_batch
+
+        def cached_agent_response(agent_id: str, query: str) -> str:
+            return self.cached((provider(), agent_id), query, lambda: get_agent_response(agent_id, query))
+
+        def cached_multi_agent_response(agent_ids: List[str], query: str) -> Dict[str, str]:
+            scopes = {agent_id: (provider(), agent_id) for agent_id in agent_ids}
+            return self.cached_many(scopes, query, lambda missing: get_multi_agent_response(missing, query))
+
+        def cached_coordinated_response(query: str) -> str:
+            return self.cached((provider(), 'coordinated'), query, lambda: get_coordinated_response(query))
+
+        def cached_coordinated_responses_batch(queries: List[str]) -> List[str]:
+            return self.cached_batch((provider(), 'coordinated'), queries, get_coordinated_responses_batch)
+
+        ai_system.get_agent_response = cached_agent_response
+        ai_system.get_coordinated_response = cached_coordinated_response
+        ai_system.get_multi_agent_response = cached_multi_agent_response
+        ai_system.get_coordinated_responses_batch = cached_coordinated_responses_batch
+        return ai_system
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Semantic Response Cache for Project Eidolon AI Providers
+Reuses AI responses for queries that are close in meaning to ones already answered
+"""
+
+import re
+import threading
+import time
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from response_cache import ResponseCache
+
+try:
+    from sentence_transformers import SentenceTransformer
+except ImportError:  # sentence-transformers is optional; fall back to hashed word vectors
+    SentenceTransformer = None
+
+EMBEDDING_MODEL = 'sentence-transformers/all-MiniLM-L6-v2'
+HASH_DIMENSIONS = 1024
+
+_TOKEN_RE = re.compile(r"[a-z0-9']+")
+
+class HashingEmbedder:
+    """Dependency-free embedder: hashed word and word-pair counts, normalized to unit length"""
+
+    def __init__(self, dimensions: int = HASH_DIMENSIONS):
+        self.dimensions = dimensions
+
+    def embed(self, text: str) -> np.ndarray:
+        """Embed a text as a unit-length float32 vector"""
+        tokens = _TOKEN_RE.findall(text.lower())
+        features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        for feature in features:
+            vector[zlib.crc32(feature.encode('utf-8')) % self.dimensions] += 1.0
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def embed_batch(self, texts: List[str]) -> np.ndarray:
+        """Embed several texts as rows of a float32 matrix"""
+        return np.array([self.embed(text) for text in texts], dtype=np.float32).reshape(len(texts), self.dimensions)
+
+class SentenceTransformerEmbedder:
+    """Embedder backed by a local sentence-transformers model"""
+
+    def __init__(self, model_name: str = EMBEDDING_MODEL):
+        self.model = SentenceTransformer(model_name)
+
+    def embed(self, text: str) -> np.ndarray:
+        """Embed a text as a unit-length float32 vector"""
+        return self.model.encode(text, normalize_embeddings=True).astype(np.float32)
+
+    def embed_batch(self, texts: List[str]) -> np.ndarray:
+        """Embed several texts in one forward pass, one row per text"""
+        return self.model.encode(list(texts), normalize_embeddings=True).astype(np.float32)
+
+def default_embedder():
+    """Use sentence-transformers when it is installed, otherwise hashed word vectors"""
+    if SentenceTransformer is not None:
+        return SentenceTransformerEmbedder()
+    return HashingEmbedder()
+
+class SemanticCache(ResponseCache):
+    """Cosine-similarity cache of (query, response) pairs, scoped by provider and agent"""
+
+    def __init__(self, threshold: float = 0.92, ttl: float = 3600, embedder=None):
+        super().__init__()
+        self.threshold = threshold
+        self.ttl = ttl
+        self.embedder = embedder or default_embedder()
+        # scope -> (stacked query vectors, responses, insertion times)
+        self._entries: Dict[Tuple[str, str], Tuple[np.ndarray, List[str], List[float]]] = {}
+        self._lock = threading.Lock()
+        # query -> vector for queries embedded ahead of time by embed_batch()
+        self._query_vectors: Dict[str, np.ndarray] = {}
+
+    def _get(self, scope: Tuple[str, str], vector: np.ndarray) -> Optional[str]:
+        """Return the cached response closest to vector in scope, if it is similar enough and not expired"""
+        with self._lock:
+            entry = self._entries.get(scope)
+            if entry is None:
+                return None
+            vectors, responses, times = entry
+            # Vectors are unit length, so the dot product is the cosine similarity
+            scores = vectors @ vector
+            best = int(np.argmax(scores))
+            if scores[best] >= self.threshold and time.time() - times[best] <= self.ttl:
+                return responses[best]
+            return None
+
+    def _put(self, scope: Tuple[str, str], vector: np.ndarray, response: str):
+        """Store a response under its query vector, dropping expired entries in the scope"""
+        now = time.time()
+        with self._lock:
+            vectors, responses, times = self._entries.get(scope, (np.zeros((0, vector.size), dtype=np.float32), [], []))
+            live = [i for i, t in enumerate(times) if now - t <= self.ttl]
+            self._entries[scope] = (
+                np.vstack([vectors[live], vector[np.newaxis, :]]),
+                [responses[i] for i in live] + [response],
+                [times[i] for i in live] + [now],
+            )
+
+    def embed_batch(self, queries: List[str]) -> Dict[str, np.ndarray]:
+        """Embed queries in one call and keep the vectors so later lookups skip embedding them"""
+        vectors = dict(zip(queries, self.embedder.embed_batch(queries)))
+        with self._lock:
+            self._query_vectors.update(vectors)
+        return vectors
+
+    def _vector(self, query: str) -> np.ndarray:
+        """Vector for query, reusing one from embed_batch() when there is one"""
+        vector = self._query_vectors.get(query)
+        return vector if vector is not None else self.embedder.embed(query)
+
+    def _prepare(self, query: str) -> np.ndarray:
+        """Embedding of query; every query can be cached"""
+        return self._vector(query)
+
+    def wrap(self, ai_system):
+        """Route an AgentAISystem's response methods through this cache (see ResponseCache.wrap), and give the
+        system embed_batch() for embedding queries ahead of the lookups"""
+        super().wrap(ai_system)
+        ai_system.embed_batch = self.embed_batch
+        return ai_system
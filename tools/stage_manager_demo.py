@@ -8,6 +8,20 @@ import requests
 import json
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib json module
+    orjson = None
+
+# One keep-alive connection for all requests to the visualizer
+_SESSION = requests.Session()
+
+def response_json(response):
+    """Decode a JSON response body, using orjson on the raw bytes when it is installed"""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return json.loads(response.content)
+
 def get_stage_manager_status():
     """Get The Stage Manager's current status and capabilities"""
     base_url = "http://localhost:5002"
@@ -17,8 +31,8 @@ def get_stage_manager_status():
     
     # Get The Stage Manager's agent data
     try:
-        response = requests.get(f"{base_url}/api/agents")
-        agents = response.json()
+        response = _SESSION.get(f"{base_url}/api/agents")
+        agents = response_json(response)
         stage_manager = next((agent for agent in agents if agent['id'] == 'stage_manager'), None)
         
         if stage_manager:
@@ -37,8 +51,8 @@ def get_stage_manager_status():
     
     # Get The Stage Manager's authority domains
     try:
-        response = requests.get(f"{base_url}/api/relationships?agent_id=stage_manager")
-        relationships = response.json()
+        response = _SESSION.get(f"{base_url}/api/relationships?agent_id=stage_manager")
+        relationships = response_json(response)
         
         print("🎭 Authority Domains (Interdisciplinary Coordination):")
         print("-" * 50)
@@ -49,8 +63,8 @@ def get_stage_manager_status():
         print()
         
         # Get detailed information about each domain
-        response = requests.get(f"{base_url}/api/entities")
-        entities = response.json()
+        response = _SESSION.get(f"{base_url}/api/entities")
+        entities = response_json(response)
         
         stage_manager_domains = [rel['to'] for rel in relationships]
         
@@ -111,8 +125,8 @@ def show_network_analysis():
     print("=" * 25)
     
     try:
-        response = requests.get("http://localhost:5002/api/graph-data")
-        graph_data = response.json()
+        response = _SESSION.get("http://localhost:5002/api/graph-data")
+        graph_data = response_json(response)
         
         nodes = graph_data.get('nodes', [])
         links = graph_data.get('links', [])
@@ -6,6 +6,20 @@ Test the Project Eidolon Graph Visualizer API endpoints
 import requests
 import json
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib json module
+    orjson = None
+
+# One keep-alive connection for all requests to the visualizer
+_SESSION = requests.Session()
+
+def response_json(response):
+    """Decode a JSON response body, using orjson on the raw bytes when it is installed"""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return json.loads(response.content)
+
 def test_api():
     """Test the API endpoints"""
     base_url = "http://localhost:5002"
@@ -15,9 +29,9 @@ def test_api():
     
     # Test agents endpoint
     try:
-        response = requests.get(f"{base_url}/api/agents")
+        response = _SESSION.get(f"{base_url}/api/agents")
         if response.status_code == 200:
-            agents = response.json()
+            agents = response_json(response)
             print(f"✅ Agents API: {len(agents)} agents loaded")
             for agent in agents:
                 print(f"   • {agent['agent']} (strain: {agent['current_strain']})")
@@ -30,9 +44,9 @@ def test_api():
     
     # Test entities endpoint
     try:
-        response = requests.get(f"{base_url}/api/entities")
+        response = _SESSION.get(f"{base_url}/api/entities")
         if response.status_code == 200:
-            entities = response.json()
+            entities = response_json(response)
             print(f"✅ Entities API: {len(entities)} entities loaded")
             for entity in entities[:5]:  # Show first 5
                 print(f"   • {entity['name']} ({entity['entity_type']})")
@@ -47,9 +61,9 @@ def test_api():
     
     # Test relationships endpoint
     try:
-        response = requests.get(f"{base_url}/api/relationships")
+        response = _SESSION.get(f"{base_url}/api/relationships")
         if response.status_code == 200:
-            relationships = response.json()
+            relationships = response_json(response)
             print(f"✅ Relationships API: {len(relationships)} relationships loaded")
             for rel in relationships[:5]:  # Show first 5
                 print(f"   • {rel['from']} -> {rel['to']} ({rel['type']})")
@@ -64,9 +78,9 @@ def test_api():
     
     # Test graph data endpoint
     try:
-        response = requests.get(f"{base_url}/api/graph-data")
+        response = _SESSION.get(f"{base_url}/api/graph-data")
         if response.status_code == 200:
-            graph_data = response.json()
+            graph_data = response_json(response)
             nodes = graph_data.get('nodes', [])
             links = graph_data.get('links', [])
             print(f"✅ Graph Data API: {len(nodes)} nodes, {len(links)} links")
@@ -4,154 +4,319 @@ Test Cursor AI Integration for Project Eidolon
 Demonstrates AI provider switching and agent coordination
 """
 
+import argparse
 import json
+import logging
+import mmap
 import os
-from cursor_ai_integration import create_ai_system, AI_CONFIG
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
-def test_ai_integration():
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib json module
+    orjson = None
+
+# Test output goes through this logger; EIDOLON_LOG=WARNING silences it (and skips the formatting) in benchmarks
+logger = logging.getLogger("eidolon.test")
+_log_level = os.environ.get('EIDOLON_LOG', 'INFO').upper()
+# getLevelName maps a known level name to its number and anything else to a "Level ..." string
+_log_level_known = isinstance(logging.getLevelName(_log_level), int)
+logger.setLevel(_log_level if _log_level_known else logging.INFO)
+logger.propagate = False
+_handler = logging.StreamHandler(sys.stdout)
+_handler.setFormatter(logging.Formatter('%(message)s'))
+logger.addHandler(_handler)
+if not _log_level_known:
+    logger.warning("Unknown EIDOLON_LOG level %r, using INFO", os.environ['EIDOLON_LOG'])
+
+
+# Static test data, built once at import
+_TEST_QUERIES = (
+    "What is calculus?",
+    "How does logic apply to creative thinking?",
+    "What are the philosophical implications of computation?",
+    "Explain the relationship between mathematics and physics",
+)
+
+# Agents answering each test query, with their display titles
+AGENTS = (('engineer', 'Engineer'), ('skeptic', 'Skeptic'), ('dreamer', 'Dreamer'))
+_AGENT_IDS = [agent_id for agent_id, _ in AGENTS]
+
+_TRANSITION_STEPS = (
+    ("OpenAI API", (
+        "1. Get OpenAI API key from https://platform.openai.com",
+        "2. Set environment variable: export OPENAI_API_KEY='your-key'",
+        "3. Update ai_config.json: set 'current_provider' to 'openai'",
+        "4. Restart the AI system",
+    )),
+    ("Anthropic Claude", (
+        "1. Get Anthropic API key from https://console.anthropic.com",
+        "2. Set environment variable: export ANTHROPIC_API_KEY='your-key'",
+        "3. Update ai_config.json: set 'current_provider' to 'anthropic'",
+        "4. Restart the AI system",
+    )),
+    ("Custom Models", (
+        "1. Train or obtain custom AI models",
+        "2. Place models in ./models/ directory",
+        "3. Update ai_config.json: set 'current_provider' to 'custom'",
+        "4. Configure model paths and parameters",
+        "5. Restart the AI system",
+    )),
+)
+
+_CONFIG_FILE = "ai_config.json"
+_PROVIDERS = ('cursor', 'openai', 'custom')
+
+@lru_cache(maxsize=4)
+def _load_config(path, mtime):
+    """Parse a config file through a read-only memory map; mtime is part of the cache key so edits are picked up"""
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        raw = mm[:]
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+def _provider_enabled(provider):
+    """Whether ai_config.json enables provider; without a config file every provider counts as enabled"""
+    if not os.path.exists(_CONFIG_FILE):
+        return True
+    configured = _load_config(_CONFIG_FILE, os.path.getmtime(_CONFIG_FILE))['providers']
+    return bool(configured.get(provider, {}).get('enabled'))
+
+# Runs that check provider behaviour set EIDOLON_NO_CACHE=1 (or pass --no-cache) so every answer
+# comes from the provider instead of an earlier run's response cache
+_response_caching = not os.environ.get('EIDOLON_NO_CACHE')
+
+# The AI stack (numpy, requests, the provider clients) is imported inside the functions that use it,
+# so --help and the configuration-only paths start without loading it
+
+@lru_cache(maxsize=2)
+def _caches(response_caching=True):
+    """The response and knowledge base caches, created on first use and shared by every AI system
+    
+    With response_caching off the exact and semantic caches are None and only the knowledge base
+    cache is used.
+    """
+    from kb_cache import KnowledgeBaseCache
+    
+    if not response_caching:
+        return None, None, KnowledgeBaseCache()
+    
+    from llm_exact_cache import ExactCache
+    from semantic_cache import SemanticCache
+    
+    # Entries are scoped by provider, knowledge base and agent. Exact repeats are answered from disk
+    # first, near-duplicates from the in-memory semantic cache; knowledge base responses are kept on
+    # disk and revalidated with the server's ETag.
+    return ExactCache(ttl=3600), SemanticCache(threshold=0.92, ttl=3600), KnowledgeBaseCache()
+
+def _warm_provider(provider):
+    """Create a provider client and let it pay its start-up costs"""
+    from cursor_ai_integration import AIProviderFactory, AI_CONFIG
+    
+    AIProviderFactory.create_provider(provider, **AI_CONFIG['providers'].get(provider, {})).warm_up()
+
+def wrap_caches(ai_system):
+    """Put the exact-match cache in front of the semantic cache, and the KB cache under the loader"""
+    exact_cache, response_cache, kb_cache = _caches(_response_caching)
+    if _response_caching:
+        ai_system = exact_cache.wrap(response_cache.wrap(ai_system))
+    return kb_cache.wrap(ai_system)
+
+def create_cached_ai_system():
+    """Create the AI system with the exact-match cache in front of the semantic cache"""
+    from cursor_ai_integration import create_ai_system
+    
+    return wrap_caches(create_ai_system())
+
+def test_ai_integration(queries=_TEST_QUERIES):
     """Test the AI integration system"""
-    print("🎭 Testing Cursor AI Integration")
-    print("=" * 50)
+    logger.info("🎭 Testing Cursor AI Integration")
+    logger.info("=" * 50)
     
     # Create AI system
-    ai_system = create_ai_system()
+    ai_system = create_cached_ai_system()
     
     # Load knowledge base
-    print("📚 Loading knowledge base...")
+    logger.info("📚 Loading knowledge base...")
     ai_system.load_knowledge_base("http://localhost:5002")
     
-    # Test queries
-    test_queries = [
-        "What is calculus?",
-        "How does logic apply to creative thinking?",
-        "What are the philosophical implications of computation?",
-        "Explain the relationship between mathematics and physics"
-    ]
+    # Embed every query for the semantic cache in one call instead of once per lookup
+    if _response_caching:
+        ai_system.embed_batch(queries)
     
-    print("\n🧪 Testing AI Responses:")
-    print("-" * 30)
+    logger.info("\n🧪 Testing AI Responses:")
+    logger.info("-" * 30)
     
-    for i, query in enumerate(test_queries, 1):
-        print(f"\n{i}. Query: {query}")
-        print("-" * 20)
+    # All coordinated responses come from one batched request and the individual agents answer
+    # each query together in one request; everything runs at once and is printed in query order
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        coordinated = executor.submit(ai_system.get_coordinated_responses_batch, list(queries))
+        individual = [executor.submit(ai_system.get_multi_agent_response, _AGENT_IDS, query) for query in queries]
+        coordinated = coordinated.result()
         
-        # Test coordinated response
-        response = ai_system.get_coordinated_response(query)
-        print(f"Coordinated Response: {response}")
-        
-        # Test individual agent responses
-        agents = ['engineer', 'skeptic', 'dreamer']
-        for agent in agents:
-            response = ai_system.get_agent_response(agent, query)
-            print(f"{agent.title()}: {response}")
+        for i, query in enumerate(queries):
+            logger.info("\n%s. Query: %s", i + 1, query)
+            logger.info("-" * 20)
+            
+            # Test coordinated response
+            logger.info("Coordinated Response: %s", coordinated[i])
+            
+            # Test individual agent responses
+            responses = individual[i].result()
+            for agent_id, agent_title in AGENTS:
+                logger.info("%s: %s", agent_title, responses[agent_id])
     
-    print("\n✅ AI Integration Test Complete!")
+    logger.info("\n✅ AI Integration Test Complete!")
 
-def test_provider_switching():
+def test_provider_switching(candidates=_PROVIDERS):
     """Test switching between AI providers"""
-    print("\n🔄 Testing Provider Switching")
-    print("=" * 40)
+    import asyncio
+    from cursor_ai_integration import AI_CONFIG
     
-    providers = ['cursor', 'openai', 'custom']
+    logger.info("\n🔄 Testing Provider Switching")
+    logger.info("=" * 40)
     
-    for provider in providers:
-        print(f"\n📡 Switching to {provider} provider...")
-        
-        # Update configuration
-        AI_CONFIG['current_provider'] = provider
-        
-        # Create new AI system
-        ai_system = create_ai_system()
-        ai_system.load_knowledge_base("http://localhost:5002")
-        
-        # Test response
-        query = "What is the nature of consciousness?"
-        response = ai_system.get_coordinated_response(query)
-        print(f"Response: {response}")
+    # Only query providers enabled in the config
+    providers = [provider for provider in candidates if _provider_enabled(provider)]
+    for provider in candidates:
+        if provider not in providers:
+            logger.info("⏭ Skipped %s provider (disabled in %s)", provider, _CONFIG_FILE)
+    
+    # Load the knowledge base once; each provider gets its own system sharing it
+    ai_system = create_cached_ai_system()
+    ai_system.load_knowledge_base("http://localhost:5002")
+    
+    # The query is the same for every provider, so embed it once up front
+    query = "What is the nature of consciousness?"
+    if _response_caching:
+        ai_system.embed_batch([query])
+    
+    async def _probe(provider):
+        provider_system = wrap_caches(ai_system.with_provider(provider))
+        return await asyncio.to_thread(provider_system.get_coordinated_response, query)
+    
+    async def _probe_all():
+        return await asyncio.gather(*[_probe(provider) for provider in providers])
+    
+    # The providers are independent, so query them concurrently and report in order
+    for provider, response in zip(providers, asyncio.run(_probe_all())):
+        logger.info("\n📡 Switching to %s provider...", provider)
+        logger.info("Response: %s", response)
     
     # Reset to cursor
     AI_CONFIG['current_provider'] = 'cursor'
-    print(f"\n✅ Reset to {AI_CONFIG['current_provider']} provider")
+    logger.info("\n✅ Reset to %s provider", AI_CONFIG['current_provider'])
 
 def show_configuration():
     """Show current AI configuration"""
-    print("\n⚙️ Current AI Configuration:")
-    print("=" * 40)
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    
+    # Collect the lines and log them in one call rather than one record per line
+    buf = ["\n⚙️ Current AI Configuration:", "=" * 40]
     
-    config_file = "ai_config.json"
-    if os.path.exists(config_file):
-        with open(config_file, 'r') as f:
-            config = json.load(f)
+    if os.path.exists(_CONFIG_FILE):
+        config = _load_config(_CONFIG_FILE, os.path.getmtime(_CONFIG_FILE))
         
         current_provider = config['current_provider']
         providers = config['providers']
         
-        print(f"Current Provider: {current_provider}")
-        print(f"Provider Details: {providers[current_provider]['name']}")
-        print(f"Description: {providers[current_provider]['description']}")
-        print(f"Enabled: {providers[current_provider]['enabled']}")
+        buf.append(f"Current Provider: {current_provider}")
+        buf.append(f"Provider Details: {providers[current_provider]['name']}")
+        buf.append(f"Description: {providers[current_provider]['description']}")
+        buf.append(f"Enabled: {providers[current_provider]['enabled']}")
         
-        print(f"\nAvailable Providers:")
+        buf.append("\nAvailable Providers:")
         for provider_id, provider_info in providers.items():
             status = "✅" if provider_info['enabled'] else "❌"
-            print(f"  {status} {provider_id}: {provider_info['name']}")
+            buf.append(f"  {status} {provider_id}: {provider_info['name']}")
     else:
-        print("❌ Configuration file not found")
+        buf.append("❌ Configuration file not found")
+    
+    logger.info("\n".join(buf))
 
 def demonstrate_transition_path():
     """Demonstrate how to transition to other AI providers"""
-    print("\n🛤️ Transition Path to Other AI Providers:")
-    print("=" * 50)
-    
-    transition_steps = {
-        "OpenAI API": [
-            "1. Get OpenAI API key from https://platform.openai.com",
-            "2. Set environment variable: export OPENAI_API_KEY='your-key'",
-            "3. Update ai_config.json: set 'current_provider' to 'openai'",
-            "4. Restart the AI system"
-        ],
-        "Anthropic Claude": [
-            "1. Get Anthropic API key from https://console.anthropic.com",
-            "2. Set environment variable: export ANTHROPIC_API_KEY='your-key'",
-            "3. Update ai_config.json: set 'current_provider' to 'anthropic'",
-            "4. Restart the AI system"
-        ],
-        "Custom Models": [
-            "1. Train or obtain custom AI models",
-            "2. Place models in ./models/ directory",
-            "3. Update ai_config.json: set 'current_provider' to 'custom'",
-            "4. Configure model paths and parameters",
-            "5. Restart the AI system"
-        ]
-    }
-    
-    for provider, steps in transition_steps.items():
-        print(f"\n📋 {provider}:")
-        for step in steps:
-            print(f"  {step}")
-
-def main():
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    
+    buf = ["\n🛤️ Transition Path to Other AI Providers:", "=" * 50]
+    
+    for provider, steps in _TRANSITION_STEPS:
+        buf.append(f"\n📋 {provider}:")
+        buf.extend(f"  {step}" for step in steps)
+    
+    logger.info("\n".join(buf))
+
+def parse_args(argv=None):
+    """Command line options for trimming the test run"""
+    parser = argparse.ArgumentParser(description="Test the Cursor AI integration for Project Eidolon")
+    parser.add_argument('--smoke', action='store_true',
+                        help="quick check: configuration plus one test query, no provider switching")
+    parser.add_argument('--no-switching', action='store_true', help="skip the provider switching test")
+    parser.add_argument('--providers', default=','.join(_PROVIDERS),
+                        help="comma-separated providers for the switching test (default: %(default)s)")
+    parser.add_argument('--no-cache', action='store_true', default=not _response_caching,
+                        help="send every query to the provider instead of the response caches "
+                             "(also set by EIDOLON_NO_CACHE=1)")
+    args = parser.parse_args(argv)
+    
+    args.providers = tuple(provider.strip() for provider in args.providers.split(',') if provider.strip())
+    unknown = [provider for provider in args.providers if provider not in _PROVIDERS]
+    if unknown:
+        parser.error(f"unknown provider(s): {', '.join(unknown)}; choose from {', '.join(_PROVIDERS)}")
+    return args
+
+def main(argv=None):
     """Main test function"""
-    print("🎭 Project Eidolon - Cursor AI Integration Test")
-    print("=" * 60)
+    global _response_caching
+    args = parse_args(argv)
+    switching = not (args.smoke or args.no_switching)
+    _response_caching = not args.no_cache
+    
+    logger.info("🎭 Project Eidolon - Cursor AI Integration Test")
+    logger.info("=" * 60)
+    
+    # Warm the providers in the background while the configuration and first tests run
+    warmers = ThreadPoolExecutor(max_workers=len(_PROVIDERS))
+    warm_ups = {}
+    if switching:
+        for provider in args.providers:
+            if _provider_enabled(provider):
+                warm_ups[provider] = warmers.submit(_warm_provider, provider)
     
     # Show configuration
     show_configuration()
     
     # Test AI integration
-    test_ai_integration()
+    test_ai_integration(_TEST_QUERIES[:1] if args.smoke else _TEST_QUERIES)
     
     # Test provider switching
-    test_provider_switching()
+    warmers.shutdown(wait=True)
+    # A misconfigured provider should show up here, not later as a confusing switching failure
+    for provider, future in warm_ups.items():
+        if future.exception() is not None:
+            logger.warning("⚠️ Warm-up failed for %s provider: %s", provider, future.exception())
+    if switching:
+        test_provider_switching(args.providers)
     
     # Show transition path
-    demonstrate_transition_path()
+    if not args.smoke:
+        demonstrate_transition_path()
     
-    print("\n🎭 Test Complete!")
-    print("\nTo start the interactive AI interface:")
-    print("  python3 tools/ai_interaction_interface.py")
-    print("\nTo switch AI providers:")
-    print("  Edit tools/ai_config.json and change 'current_provider'")
+    logger.info("\n🎭 Test Complete!")
+    exact_cache, response_cache, kb_cache = _caches(_response_caching)
+    if _response_caching:
+        logger.info("Exact cache: %s hits, %s misses", exact_cache.hits, exact_cache.misses)
+        logger.info("Semantic cache: %s hits, %s misses", response_cache.hits, response_cache.misses)
+    else:
+        logger.info("Response caches: disabled")
+    logger.info("Knowledge base cache: %s revalidated, %s downloaded", kb_cache.hits, kb_cache.misses)
+    logger.info("\nTo start the interactive AI interface:")
+    logger.info("  python3 tools/ai_interaction_interface.py")
+    logger.info("\nTo switch AI providers:")
+    logger.info("  Edit tools/ai_config.json and change 'current_provider'")
 
 if __name__ == '__main__':
     main() 
\ No newline at end of file